@@ -1,17 +1,30 @@
 """Agent principal Infra-Mapper."""
 
+import asyncio
+import functools
+import gzip
+import hashlib
 import os
+import signal
 import socket
 import logging
 import time
 import uuid
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
 
 import httpx
-import schedule
 
 from config import get_config, AgentConfig
-from models import AgentReport, HostInfo, AgentMetadata, HostMetricsReport, ContainerMetricsReport
+from models import (
+    AgentReport,
+    HostInfo,
+    AgentMetadata,
+    HostMetricsReport,
+    ContainerMetricsReport,
+    NetworkConnectionBatch,
+)
 from collectors import (
     DockerCollector,
     NetworkCollector,
@@ -32,10 +45,20 @@ logging.basicConfig(
 )
 logger = logging.getLogger("infra-mapper-agent")
 
+# Le hostname ne change pas pendant la vie du processus: lu une seule fois
+_HOSTNAME = socket.gethostname()
+
 
 class InfraMapperAgent:
     """Agent de collecte Infra-Mapper."""
 
+    # Durées de validité (secondes) des sous-résultats mis en cache entre deux scans
+    TAILSCALE_CACHE_TTL = 60
+    DOCKER_CACHE_TTL = 300
+
+    # Délai max (secondes) pour envoyer les rapports en attente à l'arrêt
+    SHUTDOWN_FLUSH_TIMEOUT = 10
+
     def __init__(self, config: AgentConfig = None):
         """Initialise l'agent."""
         self.config = config or get_config()
@@ -47,10 +70,10 @@ class InfraMapperAgent:
         self.agent_id = self.config.agent_id or self._generate_agent_id()
 
         # Hostname
-        self.hostname = self.config.hostname or socket.gethostname()
+        self.hostname = self.config.hostname or _HOSTNAME
 
-        # Temps de démarrage pour calculer l'uptime
-        self.start_time = time.time()
+        # Temps de démarrage (horloge monotone) pour calculer l'uptime
+        self.start_time = time.monotonic()
 
         # Dernière erreur rencontrée
         self.last_error: str = None
@@ -58,6 +81,19 @@ class InfraMapperAgent:
         # Serveur de commandes
         self.command_server: CommandServer = None
 
+        # File des rapports en attente d'envoi (créée dans la boucle asyncio)
+        self._report_queue: asyncio.Queue = None
+
+        # Signal d'arrêt de la boucle principale et boucle associée
+        self._stop_event: asyncio.Event = None
+        self._loop: asyncio.AbstractEventLoop = None
+
+        # Pool de threads pour exécuter les collecteurs en parallèle
+        self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="collector")
+
+        # Cache des sous-résultats qui changent rarement: nom -> (timestamp, génération, valeur)
+        self._cache: dict[str, tuple[float, object, object]] = {}
+
         # Collecteurs
         self.docker_collector = DockerCollector(self.config.docker_socket)
         self.network_collector = NetworkCollector()
@@ -71,6 +107,8 @@ class InfraMapperAgent:
                 capture_duration=self.config.tcpdump_duration,
                 capture_interval=self.config.tcpdump_interval,
                 max_packets_per_container=self.config.tcpdump_max_packets,
+                docker_client=self.docker_collector.client,
+                shared_capture=self.config.tcpdump_shared_capture,
             )
             logger.info(
                 f"Tcpdump activé: mode={tcpdump_mode.value}, "
@@ -80,21 +118,49 @@ class InfraMapperAgent:
         else:
             self.tcpdump_collector = None
 
-        # Client HTTP
-        self.http_client = httpx.Client(
+        # Client HTTP (HTTP/2 si négocié via TLS, connexions gardées entre deux rapports)
+        self.http_client = httpx.AsyncClient(
             base_url=self.config.backend_url,
             headers={
                 "Authorization": f"Bearer {self.config.api_key}",
                 "Content-Type": "application/json",
             },
-            timeout=30.0,
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            http2=True,
+            limits=httpx.Limits(
+                max_keepalive_connections=20,
+                max_connections=100,
+                keepalive_expiry=self.config.scan_interval * 2,
+            ),
         )
 
         logger.info(f"Agent initialisé: {self.agent_id} ({self.hostname})")
 
-    def _generate_agent_id(self) -> str:
+    def _run_blocking(self, func, *args, **kwargs):
+        """Exécute un collecteur bloquant dans le pool de threads de l'agent."""
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    async def _cached(self, name: str, ttl: float, func, generation: object = None):
+        """
+        Retourne le résultat mis en cache de func, ou le recalcule si le TTL est
+        expiré ou si la génération a évolué depuis le dernier appel.
+        """
+        now = time.monotonic()
+        entry = self._cache.get(name)
+        if entry and now - entry[0] < ttl and entry[1] == generation:
+            return entry[2]
+
+        value = await self._run_blocking(func)
+        if value is not None:
+            self._cache[name] = (now, generation, value)
+        return value
+
+    @staticmethod
+    @functools.cache
+    def _generate_agent_id() -> str:
         """Génère un ID stable et unique pour l'agent basé sur la machine."""
-        hostname = socket.gethostname()
+        hostname = _HOSTNAME
 
         # Essayer de lire le machine-id Linux (stable entre redémarrages)
         machine_id = None
@@ -109,67 +175,98 @@ class InfraMapperAgent:
         if machine_id:
             return f"{hostname}-{machine_id}"
 
-        # Fallback: utiliser un hash du hostname (moins unique mais stable)
-        import hashlib
-        hostname_hash = hashlib.md5(hostname.encode()).hexdigest()[:8]
+        # Fallback: utiliser un hash du hostname (moins unique mais stable).
+        # MD5 est conservé pour ne pas changer l'ID des agents déjà enregistrés.
+        hostname_hash = hashlib.md5(hostname.encode(), usedforsecurity=False).hexdigest()[:8]
         return f"{hostname}-{hostname_hash}"
 
-    def collect(self) -> AgentReport:
+    async def collect(self) -> AgentReport:
         """Collecte toutes les informations."""
         logger.info("Début de la collecte...")
-        collect_start = time.time()
-
-        # Collecter les informations de l'hôte
-        local_ips = self.network_collector.get_local_ips()
-        tailscale_info = None
-        if self.config.tailscale_enabled:
-            tailscale_info = self.tailscale_collector.collect()
+        collect_start = time.monotonic()
+
+        # Les collecteurs sont bloquants (socket Docker, /proc, sous-processus) :
+        # ils tournent en parallèle dans le pool de l'agent, ce qui laisse aussi
+        # la boucle libre d'envoyer le rapport précédent pendant la collecte.
+
+        # 1. Collecteurs indépendants
+        # Réseaux et version Docker ne sont recollectés que si un événement Docker
+        # est arrivé depuis (ou à expiration du TTL), Tailscale toutes les minutes
+        docker_generation = self.docker_collector.events_generation
+        tailscale_task = (
+            self._cached("tailscale", self.TAILSCALE_CACHE_TTL, self.tailscale_collector.collect)
+            if self.config.tailscale_enabled
+            else asyncio.sleep(0, result=None)
+        )
+        (
+            local_ips,
+            tailscale_info,
+            docker_version,
+            containers,
+            networks,
+            connections,
+            host_metrics,
+        ) = await asyncio.gather(
+            self._run_blocking(self.network_collector.get_local_ips),
+            tailscale_task,
+            self._cached(
+                "docker_version",
+                self.DOCKER_CACHE_TTL,
+                self.docker_collector.get_docker_version,
+                generation=docker_generation,
+            ),
+            # Les dépendances sont détectées dans DockerCollector
+            self._run_blocking(self.docker_collector.collect_containers),
+            self._cached(
+                "networks",
+                self.DOCKER_CACHE_TTL,
+                self.docker_collector.collect_networks,
+                generation=docker_generation,
+            ),
+            # Connexions réseau (proc_net)
+            self._run_blocking(self.network_collector.collect_connections),
+            self._run_blocking(self.metrics_collector.collect_host_metrics),
+        )
 
         host_info = HostInfo(
             agent_id=self.agent_id,
             hostname=self.hostname,
             ip_addresses=local_ips,
             tailscale=tailscale_info,
-            docker_version=self.docker_collector.get_docker_version(),
+            docker_version=docker_version,
         )
 
-        # Collecter les conteneurs (les dépendances sont maintenant détectées dans DockerCollector)
-        containers = self.docker_collector.collect_containers()
-
-        # Collecter les réseaux
-        networks = self.docker_collector.collect_networks()
-
-        # Collecter les connexions réseau (proc_net)
-        connections = self.network_collector.collect_connections()
-
-        # Collecter les connexions via tcpdump (capture par namespace conteneur)
-        tcpdump_connections = []
-        if self.tcpdump_collector:
-            # Le nouveau collector capture directement dans les namespaces réseau
+        # 2. Collecteurs qui dépendent de la liste des conteneurs
+        tcpdump_task = (
+            # Le collector tcpdump capture directement dans les namespaces réseau
             # et associe automatiquement le container_id
-            tcpdump_connections = self.tcpdump_collector.collect(containers)
-
-        # Fusionner et dédupliquer les connexions
-        all_connections = self._merge_connections(connections, tcpdump_connections)
-
-        # Collecter les logs des containers
-        container_logs = []
-        if self.config.collect_logs:
-            container_logs = self.docker_collector.collect_all_container_logs(
+            self._run_blocking(self.tcpdump_collector.collect, containers)
+            if self.tcpdump_collector
+            else asyncio.sleep(0, result=[])
+        )
+        logs_task = (
+            self._run_blocking(
+                self.docker_collector.collect_all_container_logs,
                 containers,
                 lines=self.config.logs_lines,
-                since_seconds=self.config.logs_since_seconds
+                since_seconds=self.config.logs_since_seconds,
             )
+            if self.config.collect_logs
+            else asyncio.sleep(0, result=[])
+        )
+        tcpdump_connections, container_logs, container_metrics = await asyncio.gather(
+            tcpdump_task,
+            logs_task,
+            self._run_blocking(self.docker_collector.collect_container_metrics, containers),
+        )
 
-        # Collecter les métriques host
-        host_metrics = self.metrics_collector.collect_host_metrics()
-
-        # Collecter les métriques containers
-        container_metrics = self.docker_collector.collect_container_metrics(containers)
+        # Fusionner et dédupliquer les connexions
+        all_connections = self._merge_connections(connections, tcpdump_connections)
 
         # Calculer la durée de collecte et l'uptime
-        collect_duration_ms = int((time.time() - collect_start) * 1000)
-        uptime_seconds = int(time.time() - self.start_time)
+        collect_end = time.monotonic()
+        collect_duration_ms = int((collect_end - collect_start) * 1000)
+        uptime_seconds = int(collect_end - self.start_time)
 
         # Métadonnées de l'agent
         agent_metadata = AgentMetadata(
@@ -184,16 +281,24 @@ class InfraMapperAgent:
         # Reset de la dernière erreur après l'avoir envoyée
         self.last_error = None
 
+        # Connexions en colonnes: les noms de champs ne sont pas répétés par connexion
+        connections_batch = None
+        report_connections = all_connections
+        if self.config.columnar_connections:
+            connections_batch = NetworkConnectionBatch.from_connections(all_connections)
+            report_connections = []
+
         report = AgentReport(
             host=host_info,
             containers=containers,
             networks=networks,
-            connections=all_connections,
+            connections=report_connections,
+            connections_batch=connections_batch,
             container_logs=container_logs,
             host_metrics=host_metrics,
             container_metrics=container_metrics,
             agent=agent_metadata,
-            timestamp=datetime.utcnow(),
+            timestamp=datetime.now(timezone.utc),
         )
 
         logger.info(
@@ -211,19 +316,13 @@ class InfraMapperAgent:
         Priorise proc_net car il a le container_id.
         """
         # Clé de déduplication: (local_ip, local_port, remote_ip, remote_port, protocol)
-        seen = {}
-
-        # D'abord ajouter les connexions proc_net (ont le container_id)
-        for conn in proc_net_conns:
-            key = (conn.local_ip, conn.local_port, conn.remote_ip, conn.remote_port, conn.protocol)
-            seen[key] = conn
+        # D'abord les connexions proc_net (ont le container_id)
+        seen = {c.dedup_key: c for c in proc_net_conns}
 
         # Ajouter les connexions tcpdump uniquement si pas déjà vues
         added_from_tcpdump = 0
         for conn in tcpdump_conns:
-            key = (conn.local_ip, conn.local_port, conn.remote_ip, conn.remote_port, conn.protocol)
-            if key not in seen:
-                seen[key] = conn
+            if seen.setdefault(conn.dedup_key, conn) is conn:
                 added_from_tcpdump += 1
 
         if added_from_tcpdump > 0:
@@ -231,12 +330,21 @@ class InfraMapperAgent:
 
         return list(seen.values())
 
-    def send_report(self, report: AgentReport) -> bool:
+    async def send_report(self, report: AgentReport) -> bool:
         """Envoie le rapport au backend."""
         try:
-            response = self.http_client.post(
+            # Sérialisation directe en JSON par pydantic-core (le Content-Type
+            # application/json est déjà positionné sur le client)
+            body = report.model_dump_json().encode()
+            headers = None
+            if self.config.compress_reports:
+                # JSON très répétitif (IDs, images, IPs): niveau 1 suffit et reste rapide
+                body = gzip.compress(body, compresslevel=1)
+                headers = {"Content-Encoding": "gzip"}
+            response = await self.http_client.post(
                 "/api/v1/report",
-                json=report.model_dump(mode="json"),
+                content=body,
+                headers=headers,
             )
 
             if response.status_code == 200:
@@ -250,16 +358,74 @@ class InfraMapperAgent:
             logger.error(f"Erreur de connexion au backend: {e}")
             return False
 
-    def run_once(self):
-        """Exécute une collecte et envoi."""
+    async def run_once(self):
+        """Exécute une collecte et place le rapport dans la file d'envoi."""
         try:
-            report = self.collect()
-            success = self.send_report(report)
-            if not success:
-                self.last_error = "Échec envoi rapport au backend"
+            report = await self.collect()
         except Exception as e:
             logger.error(f"Erreur lors de la collecte: {e}", exc_info=True)
             self.last_error = str(e)
+            return
+
+        # Backend lent ou injoignable: abandonner le rapport le plus ancien
+        if self._report_queue.full():
+            self._report_queue.get_nowait()
+            self._report_queue.task_done()
+            logger.warning("File d'envoi pleine, rapport le plus ancien abandonné")
+        self._report_queue.put_nowait(report)
+
+    async def _send_loop(self):
+        """Envoie les rapports de la file au fil de l'eau."""
+        while True:
+            report = await self._report_queue.get()
+            try:
+                if not await self.send_report(report):
+                    self.last_error = "Échec envoi rapport au backend"
+            except Exception as e:
+                logger.error(f"Erreur lors de l'envoi du rapport: {e}", exc_info=True)
+                self.last_error = str(e)
+            finally:
+                self._report_queue.task_done()
+
+    async def _main(self):
+        """Boucle principale: la collecte suivante chevauche l'envoi du rapport précédent."""
+        self._report_queue = asyncio.Queue(maxsize=2)
+        self._stop_event = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+
+        # Arrêt propre sur SIGTERM (docker stop) comme sur Ctrl+C
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            self._loop.add_signal_handler(sig, self._stop_event.set)
+
+        sender = asyncio.create_task(self._send_loop())
+
+        # Échéances calculées sur l'horloge monotone: pas de dérive liée à la durée
+        # de la collecte, ni de réveil inutile entre deux scans
+        deadline = time.monotonic()
+        try:
+            while not self._stop_event.is_set():
+                await self.run_once()
+                deadline += self.config.scan_interval
+                now = time.monotonic()
+                if deadline < now:
+                    # Collecte plus longue que l'intervalle: repartir de maintenant
+                    # plutôt que d'enchaîner les scans en rafale pour rattraper
+                    deadline = now
+                try:
+                    await asyncio.wait_for(self._stop_event.wait(), deadline - now)
+                except asyncio.TimeoutError:
+                    pass
+
+            logger.info("Arrêt de l'agent")
+
+            # Laisser partir les rapports déjà collectés avant de fermer le client
+            try:
+                await asyncio.wait_for(self._report_queue.join(), self.SHUTDOWN_FLUSH_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning(f"{self._report_queue.qsize()} rapport(s) non envoyé(s) à l'arrêt")
+        finally:
+            sender.cancel()
+            await self.http_client.aclose()
 
     def run(self):
         """Démarre l'agent en mode continu."""
@@ -274,27 +440,27 @@ class InfraMapperAgent:
             )
             self.command_server.start()
 
-        # Première collecte immédiate
-        self.run_once()
-
-        # Planifier les collectes suivantes
-        schedule.every(self.config.scan_interval).seconds.do(self.run_once)
+        # Suivre les événements Docker pour invalider les caches réseaux/version
+        self.docker_collector.start_event_watcher()
 
         try:
-            while True:
-                schedule.run_pending()
-                time.sleep(1)
+            asyncio.run(self._main())
         except KeyboardInterrupt:
             logger.info("Arrêt de l'agent")
         finally:
             self.cleanup()
 
+    def stop(self):
+        """Demande l'arrêt de l'agent (utilisable depuis un autre thread)."""
+        if self._loop is not None and self._stop_event is not None:
+            self._loop.call_soon_threadsafe(self._stop_event.set)
+
     def cleanup(self):
         """Nettoie les ressources."""
         if self.command_server:
             self.command_server.stop()
         self.docker_collector.close()
-        self.http_client.close()
+        self._executor.shutdown(wait=False, cancel_futures=True)
 
 
 def main():
@@ -1,12 +1,13 @@
 """Collecteur de fichiers docker-compose."""
 
 import os
-import subprocess
+import re
+import time
 import logging
 from pathlib import Path
 from typing import Optional
 
-import yaml
+from .yaml_loader import YamlError, load_yaml
 
 logger = logging.getLogger(__name__)
 
@@ -14,46 +15,83 @@ logger = logging.getLogger(__name__)
 class ComposeCollector:
     """Collecte et parse les fichiers docker-compose.yml."""
 
-    def __init__(self, search_paths: list[str] = None):
+    COMPOSE_FILENAMES = ("docker-compose.yml", "docker-compose.yaml")
+
+    # Répertoires volumineux qui ne contiennent jamais de fichiers compose utiles
+    EXCLUDED_DIRS = frozenset({".git", "node_modules", "venv", ".venv", "__pycache__", ".cache"})
+
+    # Profondeur max de recherche sous chaque chemin (évite les arborescences pathologiques)
+    MAX_DEPTH = 6
+
+    def __init__(self, search_paths: list[str] = None, files_cache_ttl: int = 300):
         """Initialise le collecteur."""
         self.search_paths = search_paths or ["/root", "/home", "/opt", "/srv"]
+        self.files_cache_ttl = files_cache_ttl
         self._compose_cache: dict[str, dict] = {}
+        self._deps_cache: dict[str, tuple[int, dict]] = {}  # filepath -> (mtime_ns, dépendances)
+        self._files_cache: Optional[tuple[list[str], float]] = None  # (fichiers, timestamp)
 
     def find_compose_files(self) -> list[str]:
-        """Trouve tous les fichiers docker-compose.yml."""
-        compose_files = []
+        """Trouve tous les fichiers docker-compose.yml (résultat mis en cache)."""
+        now = time.monotonic()
+        if self._files_cache is not None:
+            files, timestamp = self._files_cache
+            if now - timestamp < self.files_cache_ttl:
+                return files
+
+        compose_files = set()  # Dédupliquer
 
         for base_path in self.search_paths:
-            if not os.path.exists(base_path):
+            if not os.path.isdir(base_path):
                 continue
 
             try:
-                result = subprocess.run(
-                    ["find", base_path, "-name", "docker-compose.yml", "-o", "-name", "docker-compose.yaml"],
-                    capture_output=True,
-                    text=True,
-                    timeout=30
-                )
-
-                if result.returncode == 0:
-                    files = [f.strip() for f in result.stdout.strip().split("\n") if f.strip()]
-                    compose_files.extend(files)
-
-            except subprocess.TimeoutExpired:
-                logger.warning(f"Timeout lors de la recherche dans {base_path}")
+                compose_files.update(self._walk(base_path))
             except Exception as e:
                 logger.warning(f"Erreur lors de la recherche dans {base_path}: {e}")
 
-        return list(set(compose_files))  # Dédupliquer
+        files = list(compose_files)
+        self._files_cache = (files, now)
+        return files
+
+    def _walk(self, base_path: str) -> list[str]:
+        """Parcourt une arborescence avec os.scandir à la recherche de fichiers compose."""
+        found = []
+        stack = [(base_path, 0)]
+
+        while stack:
+            current, depth = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        # Filtrer sur le nom seul: le chemin complet n'est construit
+                        # que pour les fichiers compose et les dossiers à parcourir
+                        name = entry.name
+                        try:
+                            if name in self.COMPOSE_FILENAMES:
+                                if entry.is_file(follow_symlinks=False):
+                                    found.append(entry.path)
+                            elif (
+                                depth < self.MAX_DEPTH
+                                and name not in self.EXCLUDED_DIRS
+                                and entry.is_dir(follow_symlinks=False)
+                            ):
+                                stack.append((entry.path, depth + 1))
+                        except OSError:
+                            continue
+            except (PermissionError, FileNotFoundError, NotADirectoryError):
+                continue
+
+        return found
 
     def parse_compose_file(self, filepath: str) -> Optional[dict]:
         """Parse un fichier docker-compose.yml."""
         try:
-            with open(filepath, "r") as f:
-                content = yaml.safe_load(f)
-                self._compose_cache[filepath] = content
-                return content
-        except yaml.YAMLError as e:
+            with open(filepath, "rb") as f:
+                content = load_yaml(f.read())
+            self._compose_cache[filepath] = content
+            return content
+        except YamlError as e:
             logger.warning(f"Erreur YAML dans {filepath}: {e}")
             return None
         except Exception as e:
@@ -68,11 +106,32 @@ class ComposeCollector:
         """
         dependencies = {}
 
-        content = self._compose_cache.get(filepath) or self.parse_compose_file(filepath)
+        try:
+            mtime_ns = os.stat(filepath).st_mtime_ns
+        except OSError as e:
+            logger.warning(f"Erreur lecture {filepath}: {e}")
+            return dependencies
+
+        # Fichier inchangé depuis le dernier calcul: réutiliser le résultat
+        cached = self._deps_cache.get(filepath)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+
+        # Fichier modifié (ou jamais lu): forcer une relecture du YAML
+        self._compose_cache.pop(filepath, None)
+        content = self.parse_compose_file(filepath)
         if not content:
             return dependencies
 
         services = content.get("services", {})
+        if not services:
+            return dependencies
+
+        # Une seule alternation compilée pour repérer les références aux services
+        # (les noms les plus longs d'abord pour éviter qu'un préfixe ne masque un nom)
+        service_pattern = re.compile(
+            "|".join(re.escape(name) for name in sorted(services, key=len, reverse=True))
+        )
 
         for service_name, service_config in services.items():
             deps = []
@@ -95,18 +154,19 @@ class ComposeCollector:
             # Analyser les variables d'environnement pour les dépendances implicites
             env = service_config.get("environment", {})
             if isinstance(env, list):
-                env = {e.split("=")[0]: e.split("=")[1] if "=" in e else "" for e in env}
+                values = (e.partition("=")[2] for e in env)
+            else:
+                values = env.values()
 
-            for key, value in env.items():
-                if isinstance(value, str):
-                    # Chercher des références à d'autres services
-                    for other_service in services.keys():
-                        if other_service != service_name and other_service in value:
-                            if other_service not in deps:
-                                deps.append(other_service)
+            # Chercher des références à d'autres services dans toutes les valeurs en une passe
+            env_blob = "\n".join(value for value in values if isinstance(value, str))
+            for other_service in service_pattern.findall(env_blob):
+                if other_service != service_name and other_service not in deps:
+                    deps.append(other_service)
 
             dependencies[service_name] = deps
 
+        self._deps_cache[filepath] = (mtime_ns, dependencies)
         return dependencies
 
     def get_project_name(self, filepath: str) -> str:
@@ -1,14 +1,41 @@
 """Collecteur d'informations Docker."""
 
+import hashlib
 import os
 import re
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+
 import docker
 from docker.errors import APIError
+from requests.exceptions import RequestException
 from datetime import datetime
-from typing import Optional
+from typing import Iterator, NamedTuple, Optional
 import logging
 
-import yaml
+from .yaml_loader import YamlError, load_yaml
+
+# Python 3.11+: fromisoformat accepte directement le suffixe "Z" des dates Docker
+if sys.version_info >= (3, 11):
+    _parse_iso_datetime = datetime.fromisoformat
+else:
+    def _parse_iso_datetime(value: str) -> datetime:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+# orjson si disponible pour décoder les échantillons de stats, sinon json standard
+try:
+    from orjson import dumps as _json_dumps, loads as _json_loads
+except ImportError:
+    import json
+
+    from json import loads as _json_loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
 
 from models import (
     ContainerInfo,
@@ -23,15 +50,156 @@ from models import (
 
 logger = logging.getLogger(__name__)
 
+# Variables d'environnement masquées dans le rapport
+_SECRET_KEY_RE = re.compile(r'PASSWORD|SECRET|KEY|TOKEN', re.IGNORECASE)
+
+# Variables d'environnement décrivant une connexion vers un autre service
+_CONNECTION_KEY_RE = re.compile(
+    r'(?:DATABASE|DB|REDIS|MONGO|POSTGRES|MYSQL|ELASTIC|RABBIT|KAFKA).*(?:HOST|URL|URI)'
+    r'|.*_(?:HOST|URL|URI|SERVER|ENDPOINT)$',
+    re.IGNORECASE,
+)
+
+# Patterns de connexion dans les logs, appliqués aux bytes bruts (\w = ASCII,
+# comme les noms de services compose)
+_LOG_CONNECTION_PATTERNS = (
+    re.compile(rb'[Cc]onnect(?:ed|ing)?\s+to\s+(\w+)'),
+    re.compile(rb'[Rr]esolv(?:ed|ing)?\s+(\w+)'),
+    re.compile(rb'http[s]?://(\w+)[:/]'),
+    re.compile(rb'@(\w+):'),  # Database URLs
+)
+
+
+def _demux_log_frames(data: bytes) -> Iterator[tuple[str, bytes]]:
+    """
+    Découpe des logs multiplexés en (flux, contenu).
+
+    Chaque trame commence par un en-tête de 8 octets: type de flux
+    (1 = stdout, 2 = stderr), 3 octets nuls, taille big-endian sur 4 octets.
+    """
+    offset = 0
+    end = len(data)
+    while offset + 8 <= end:
+        stream = "stderr" if data[offset] == 2 else "stdout"
+        size = int.from_bytes(data[offset + 4:offset + 8], "big")
+        offset += 8
+        yield stream, data[offset:offset + size]
+        offset += size
+
+
+class _LruCache(OrderedDict):
+    """
+    Dict borné avec éviction LRU.
+
+    Protégé par un verrou: les containers sont parsés en parallèle dans le pool.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        super().__init__()
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self:
+                return default
+            self.move_to_end(key)
+            return super().__getitem__(key)
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            super().__setitem__(key, value)
+            self.move_to_end(key)
+            while len(self) > self.maxsize:
+                self.popitem(last=False)
+
+    def retain(self, keys: set):
+        """Supprime les entrées dont la clé n'est pas dans keys."""
+        with self._lock:
+            for key in [k for k in self if k not in keys]:
+                del self[key]
+
+
+class ProjectServices(NamedTuple):
+    """Services connus d'un projet compose et patterns compilés associés."""
+    names: list[str]
+    # nom en minuscules -> nom du service, pour reconnaître un mot capturé en O(1)
+    by_lower: dict[str, str]
+    # Alternation de tous les noms (plus longs d'abord): une seule passe par valeur
+    alt_pattern: Optional[re.Pattern]
+    # (service, pattern) cherchés dans le .env: nom exact, URL, URL de BDD, variable HOST
+    env_file_patterns: list[tuple[str, re.Pattern]]
+
+    @classmethod
+    def build(cls, names: list[str]) -> "ProjectServices":
+        """Compile les patterns de recherche pour une liste de services."""
+        env_file_patterns = []
+        for service in names:
+            name = re.escape(service)
+            pattern = re.compile(
+                rf'\b{name}\b|://{name}[:/]|@{name}[:/]|HOST.*=.*{name}',
+                re.IGNORECASE,
+            )
+            env_file_patterns.append((service, pattern))
+        by_lower = {}
+        for service in names:
+            by_lower.setdefault(service.lower(), service)
+        alt_pattern = None
+        if names:
+            alternation = "|".join(re.escape(n) for n in sorted(names, key=len, reverse=True))
+            alt_pattern = re.compile(rf'\b(?:{alternation})\b', re.IGNORECASE)
+        return cls(names, by_lower, alt_pattern, env_file_patterns)
+
 
 class DockerCollector:
     """Collecte les informations des conteneurs Docker."""
 
+    # Connexions keep-alive gardées sur le socket Docker: le client est partagé
+    # entre les collecteurs qui tournent en parallèle
+    POOL_SIZE = 16
+    # Fichiers compose cherchés dans le working_dir, par ordre de priorité
+    DEFAULT_COMPOSE_FILES = ("docker-compose.yml", "docker-compose.yaml", "compose.yml", "compose.yaml")
+    # Nombre max d'entrées des caches compose/.env/services en mémoire
+    CACHE_SIZE = 128
+    # Cache disque des fichiers compose parsés
+    CACHE_DIR = os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+        "infra-mapper",
+    )
+    # Délai global de collecte des stats: un container bloqué ne retarde pas le rapport
+    STATS_TIMEOUT = 10
+
     def __init__(self, docker_socket: str = "unix:///var/run/docker.sock"):
         """Initialise le collecteur Docker."""
-        self.client = docker.DockerClient(base_url=docker_socket)
-        self._compose_cache: dict[str, dict] = {}  # Cache des fichiers compose parsés
-        self._services_by_project: dict[str, list[str]] = {}  # project -> [services]
+        self.client = docker.DockerClient(base_url=docker_socket, max_pool_size=self.POOL_SIZE)
+        # Caches des fichiers parsés, invalidés dès que (mtime, taille) change et
+        # bornés (LRU) pour ne pas grossir avec les projets supprimés
+        self._compose_cache = _LruCache(self.CACHE_SIZE)  # path -> (mtime_ns, size, contenu)
+        self._env_file_cache = _LruCache(self.CACHE_SIZE)  # path -> (mtime_ns, size, services, deps)
+        self._services_by_project = _LruCache(self.CACHE_SIZE)  # project -> ProjectServices
+
+        # Compteur incrémenté à chaque événement réseau/daemon Docker: sert de
+        # signal de changement pour les caches des réseaux et de la version
+        self.events_generation = 0
+        self._events_stream = None
+        self._events_thread: Optional[threading.Thread] = None
+        self._closed = False
+
+        # Timestamp Unix de la dernière ligne de log collectée par container
+        self._last_log_ts: dict[str, float] = {}
+        # Mode TTY par container (logs non multiplexés), relevé à l'inspect
+        self._container_tty: dict[str, bool] = {}
+        # Appel brut /logs (helpers privés de docker-py) utilisable, désactivé au
+        # premier échec inattendu au profit des appels publics
+        self._raw_logs_api = True
+
+        # Dernier échantillon de stats (JSON brut) par container, alimenté par un
+        # flux stats(stream=True) lu en continu dans un thread par container running
+        self._latest_stats: dict[str, bytes] = {}
+        self._stat_threads: dict[str, threading.Thread] = {}
+
+        # Pool pour les appels API par container (logs, stats...), borné par la taille du pool HTTP
+        self._executor = ThreadPoolExecutor(max_workers=self.POOL_SIZE, thread_name_prefix="docker")
 
     def get_docker_version(self) -> Optional[str]:
         """Retourne la version de Docker."""
@@ -42,20 +210,77 @@ class DockerCollector:
             logger.error(f"Erreur lors de la récupération de la version Docker: {e}")
             return None
 
+    def start_event_watcher(self):
+        """Démarre le suivi des événements Docker dans un thread dédié."""
+        if self._events_thread is None:
+            self._events_thread = threading.Thread(
+                target=self._watch_events, name="docker-events", daemon=True
+            )
+            self._events_thread.start()
+
+    def _watch_events(self):
+        """
+        Incrémente events_generation à chaque événement réseau ou daemon et
+        libère le flux de stats des containers arrêtés.
+        """
+        while not self._closed:
+            try:
+                # Les connexions/déconnexions de containers aux réseaux sont
+                # des événements de type "network"
+                self._events_stream = self.client.events(
+                    decode=True, filters={"type": ["network", "daemon", "container"]}
+                )
+                for event in self._events_stream:
+                    if event.get("Type") == "container":
+                        if event.get("Action") in ("die", "destroy"):
+                            self._drop_stat_stream(event.get("id", "")[:12])
+                        continue
+                    self.events_generation += 1
+            except Exception as e:
+                if self._closed:
+                    return
+                logger.debug(f"Flux d'événements Docker interrompu: {e}")
+
+            # Flux coupé (redémarrage de dockerd ?): invalider et se reconnecter
+            self.events_generation += 1
+            time.sleep(5)
+
     def collect_containers(self) -> list[ContainerInfo]:
         """Collecte les informations de tous les conteneurs."""
         containers = []
 
         try:
-            for container in self.client.containers.list(all=True):
-                container_info = self._parse_container(container)
-                if container_info:
-                    containers.append(container_info)
+            # Liste brute en un seul appel (containers.list() ferait un inspect
+            # par container, en série); size=False: pas de calcul SizeRw/SizeRootFs
+            listed = self.client.api.containers(all=True, size=False)
+
+            # L'inspect (env, santé, dates) et la lecture des logs se font ensuite
+            # en parallèle dans le pool, ordre conservé
+            results = self._executor.map(self._inspect_and_parse, [c["Id"] for c in listed])
+            containers = [c for c in results if c is not None]
+
+            # Oublier les containers et projets compose supprimés
+            listed_ids = {c["Id"][:12] for c in listed}
+            for container_id in self._container_tty.keys() - listed_ids:
+                self._container_tty.pop(container_id, None)
+            self._services_by_project.retain({c.compose_project for c in containers if c.compose_project})
         except APIError as e:
             logger.error(f"Erreur API Docker: {e}")
 
         return containers
 
+    def _inspect_and_parse(self, container_id: str) -> Optional[ContainerInfo]:
+        """Inspecte puis parse un conteneur."""
+        try:
+            container = self.client.containers.get(container_id)
+        except docker.errors.NotFound:
+            # Supprimé entre la liste et l'inspect
+            return None
+        except APIError as e:
+            logger.error(f"Erreur API Docker (inspect {container_id[:12]}): {e}")
+            return None
+        return self._parse_container(container)
+
     def _parse_container(self, container) -> Optional[ContainerInfo]:
         """Parse les informations d'un conteneur."""
         try:
@@ -93,46 +318,54 @@ class DockerCollector:
             # Labels
             labels = config.get("Labels", {}) or {}
 
+            self._container_tty[container.id[:12]] = bool(config.get("Tty"))
+
             # Environnement (filtrer les secrets potentiels)
             env_list = config.get("Env", []) or []
             environment = {}
             for env in env_list:
-                if "=" in env:
-                    key, value = env.split("=", 1)
-                    # Ne pas exposer les mots de passe et secrets
-                    if any(secret in key.upper() for secret in ["PASSWORD", "SECRET", "KEY", "TOKEN"]):
-                        value = "***HIDDEN***"
-                    environment[key] = value
+                key, sep, value = env.partition("=")
+                if not sep:
+                    continue
+                # Ne pas exposer les mots de passe et secrets
+                if _SECRET_KEY_RE.search(key):
+                    value = "***HIDDEN***"
+                environment[key] = value
 
             # Compose
             compose_project = labels.get("com.docker.compose.project")
             compose_service = labels.get("com.docker.compose.service")
 
             # Détecter les dépendances
-            declared_dependencies = []
+            declared_dependencies: list[str] = []
             if compose_project and compose_service:
                 # 1. Depuis docker-compose.yml et .env
                 compose_deps = self._get_compose_dependencies(labels, compose_project, compose_service)
                 declared_dependencies.extend(compose_deps)
+                # Le service lui-même est exclu des dépendances détectées
+                seen = set(compose_deps)
+                seen.add(compose_service)
 
                 # 2. Depuis les variables d'environnement
                 env_deps = self._get_env_dependencies(environment, compose_project)
                 for dep in env_deps:
-                    if dep not in declared_dependencies and dep != compose_service:
+                    if dep not in seen:
+                        seen.add(dep)
                         declared_dependencies.append(dep)
 
                 # 3. Depuis les logs (seulement pour les conteneurs running)
                 if status == ContainerStatus.RUNNING:
                     log_deps = self._get_log_dependencies(container, compose_project)
                     for dep in log_deps:
-                        if dep not in declared_dependencies and dep != compose_service:
+                        if dep not in seen:
+                            seen.add(dep)
                             declared_dependencies.append(dep)
 
             # Dates
-            created = datetime.fromisoformat(attrs["Created"].replace("Z", "+00:00"))
+            created = _parse_iso_datetime(attrs["Created"])
             started_at = None
             if state.get("StartedAt") and state["StartedAt"] != "0001-01-01T00:00:00Z":
-                started_at = datetime.fromisoformat(state["StartedAt"].replace("Z", "+00:00"))
+                started_at = _parse_iso_datetime(state["StartedAt"])
 
             return ContainerInfo(
                 id=container.id[:12],
@@ -142,6 +375,7 @@ class DockerCollector:
                 health=health,
                 created=created,
                 started_at=started_at,
+                pid=state.get("Pid") or None,
                 networks=networks,
                 ip_addresses=ip_addresses,
                 ports=ports,
@@ -242,7 +476,8 @@ class DockerCollector:
         Extrait les dépendances depuis le fichier docker-compose.yml.
         Utilise le label working_dir pour trouver le fichier.
         """
-        dependencies = []
+        dependencies: list[str] = []
+        seen: set[str] = set()
 
         working_dir = labels.get("com.docker.compose.project.working_dir")
         config_files = labels.get("com.docker.compose.project.config_files", "")
@@ -255,13 +490,19 @@ class DockerCollector:
         if config_files:
             compose_files = [f.strip() for f in config_files.split(",")]
         else:
-            # Fichiers par défaut
-            for name in ["docker-compose.yml", "docker-compose.yaml", "compose.yml", "compose.yaml"]:
-                path = os.path.join(working_dir, name)
-                if os.path.exists(path):
-                    compose_files.append(path)
+            # Fichiers par défaut: une seule lecture du répertoire
+            try:
+                with os.scandir(working_dir) as it:
+                    names = {entry.name for entry in it if entry.is_file()}
+            except OSError:
+                names = set()
+            for name in self.DEFAULT_COMPOSE_FILES:
+                if name in names:
+                    compose_files.append(os.path.join(working_dir, name))
                     break
 
+        project_services: dict[str, None] = {}  # Union ordonnée des services des fichiers du projet
+
         for compose_file in compose_files:
             if not os.path.exists(compose_file):
                 # Chemin relatif au working_dir
@@ -270,144 +511,216 @@ class DockerCollector:
                     continue
 
             try:
-                # Utiliser le cache si disponible
-                if compose_file in self._compose_cache:
-                    content = self._compose_cache[compose_file]
-                else:
-                    with open(compose_file, "r") as f:
-                        content = yaml.safe_load(f)
-                        self._compose_cache[compose_file] = content
-
+                content = self._load_compose_file(compose_file)
                 if not content:
                     continue
 
                 services = content.get("services", {})
 
                 # Stocker tous les services du projet pour la détection d'env
-                if compose_project not in self._services_by_project:
-                    self._services_by_project[compose_project] = list(services.keys())
+                # (recalculé à chaque fois: les fichiers ont pu changer)
+                project_services.update(dict.fromkeys(services))
+                self._set_project_services(compose_project, list(project_services))
 
                 service_config = services.get(compose_service, {})
 
-                # depends_on
+                # depends_on (liste ou dict: itérer donne les noms dans les deux cas)
                 depends_on = service_config.get("depends_on", [])
-                if isinstance(depends_on, list):
-                    dependencies.extend(depends_on)
-                elif isinstance(depends_on, dict):
-                    dependencies.extend(depends_on.keys())
+                if not isinstance(depends_on, (list, dict)):
+                    depends_on = []
+                for dep in depends_on:
+                    if dep not in seen:
+                        seen.add(dep)
+                        dependencies.append(dep)
 
                 # links (legacy)
                 links = service_config.get("links", [])
                 for link in links:
                     dep_name = link.split(":")[0]
-                    if dep_name not in dependencies:
+                    if dep_name not in seen:
+                        seen.add(dep_name)
                         dependencies.append(dep_name)
 
-                # Chercher dans .env pour les références
-                env_deps = self._parse_env_file(working_dir, compose_project)
-                for dep in env_deps:
-                    if dep not in dependencies:
-                        dependencies.append(dep)
-
-            except yaml.YAMLError as e:
+            except YamlError as e:
                 logger.warning(f"Erreur YAML dans {compose_file}: {e}")
             except Exception as e:
                 logger.debug(f"Erreur lecture compose {compose_file}: {e}")
 
+        # Chercher dans .env pour les références: une seule fois pour tous les
+        # fichiers compose, une fois les services du projet connus
+        if project_services:
+            env_deps = self._parse_env_file(working_dir, compose_project)
+            for dep in env_deps:
+                if dep not in seen:
+                    seen.add(dep)
+                    dependencies.append(dep)
+
         return dependencies
 
+    def _set_project_services(self, compose_project: str, names: list[str]):
+        """Enregistre les services d'un projet (patterns recompilés seulement s'ils changent)."""
+        current = self._services_by_project.get(compose_project)
+        if current is None or current.names != names:
+            self._services_by_project[compose_project] = ProjectServices.build(names)
+
+    def _get_project_services(self, compose_project: str) -> Optional[ProjectServices]:
+        """Retourne les services connus d'un projet."""
+        return self._services_by_project.get(compose_project)
+
+    def _load_compose_file(self, compose_file: str) -> Optional[dict]:
+        """
+        Parse un fichier compose, en cache tant que (mtime, taille) ne changent pas.
+
+        Seuls les champs utilisés (services, depends_on, links) sont conservés.
+        Ils sont aussi écrits dans un fichier JSON sous le dossier de cache, ce
+        qui évite de reparser le YAML au redémarrage de l'agent.
+        """
+        st = os.stat(compose_file)
+        cached = self._compose_cache.get(compose_file)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+
+        sidecar = os.path.join(
+            self.CACHE_DIR,
+            hashlib.blake2b(compose_file.encode(), digest_size=16).hexdigest() + ".json",
+        )
+        content = self._read_compose_sidecar(sidecar, st)
+        if content is None:
+            with open(compose_file, "rb") as f:
+                content = self._project_compose(load_yaml(f.read()))
+            self._write_compose_sidecar(sidecar, st, content)
+
+        self._compose_cache[compose_file] = (st.st_mtime_ns, st.st_size, content)
+        return content
+
+    @staticmethod
+    def _project_compose(content) -> Optional[dict]:
+        """Ne garde d'un fichier compose que les champs utilisés pour les dépendances."""
+        if not isinstance(content, dict):
+            return None
+        services = content.get("services")
+        if not isinstance(services, dict):
+            services = {}
+        projected = {}
+        for name, service_config in services.items():
+            service_config = service_config if isinstance(service_config, dict) else {}
+            projected[str(name)] = {
+                key: service_config[key]
+                for key in ("depends_on", "links")
+                if key in service_config
+            }
+        return {"services": projected}
+
+    @staticmethod
+    def _read_compose_sidecar(sidecar: str, st: os.stat_result) -> Optional[dict]:
+        """Lit le cache JSON d'un fichier compose s'il correspond à (mtime, taille)."""
+        try:
+            with open(sidecar, "rb") as f:
+                data = _json_loads(f.read())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict):
+            return None
+        if data.get("mtime_ns") != st.st_mtime_ns or data.get("size") != st.st_size:
+            return None
+        return data.get("content")
+
+    def _write_compose_sidecar(self, sidecar: str, st: os.stat_result, content: Optional[dict]):
+        """Écrit le cache JSON d'un fichier compose (remplacement atomique)."""
+        try:
+            os.makedirs(self.CACHE_DIR, exist_ok=True)
+            payload = _json_dumps({"mtime_ns": st.st_mtime_ns, "size": st.st_size, "content": content})
+            fd, tmp_path = tempfile.mkstemp(dir=self.CACHE_DIR, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp_path, sidecar)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except (OSError, TypeError) as e:
+            logger.debug(f"Cache compose non écrit ({sidecar}): {e}")
+
     def _parse_env_file(self, working_dir: str, compose_project: str) -> list[str]:
         """Parse le fichier .env pour trouver des références à d'autres services."""
         dependencies = []
         env_file = os.path.join(working_dir, ".env")
 
-        if not os.path.exists(env_file):
+        try:
+            st = os.stat(env_file)
+        except OSError:
             return dependencies
 
+        # Récupérer les services connus du projet
+        project = self._get_project_services(compose_project)
+        known_services = tuple(project.names) if project else ()
+
+        cached = self._env_file_cache.get(env_file)
+        if cached and cached[:3] == (st.st_mtime_ns, st.st_size, known_services):
+            return list(cached[3])
+
         try:
             with open(env_file, "r") as f:
                 content = f.read()
 
-            # Récupérer les services connus du projet
-            known_services = self._services_by_project.get(compose_project, [])
-
-            for service in known_services:
+            if project:
                 # Chercher des références au service dans les URLs ou hostnames
-                patterns = [
-                    rf'\b{service}\b',  # Nom exact
-                    rf'://{service}[:/]',  # URL
-                    rf'@{service}[:/]',  # Database URL
-                    rf'HOST.*=.*{service}',  # Variable HOST
-                ]
-                for pattern in patterns:
-                    if re.search(pattern, content, re.IGNORECASE):
-                        if service not in dependencies:
-                            dependencies.append(service)
-                        break
+                for service, pattern in project.env_file_patterns:
+                    if pattern.search(content) and service not in dependencies:
+                        dependencies.append(service)
 
         except Exception as e:
             logger.debug(f"Erreur lecture .env: {e}")
+            return dependencies
 
-        return dependencies
+        self._env_file_cache[env_file] = (st.st_mtime_ns, st.st_size, known_services, dependencies)
+        return list(dependencies)
 
     def _get_env_dependencies(self, environment: dict, compose_project: str) -> list[str]:
         """Extrait les dépendances depuis les variables d'environnement."""
-        dependencies = []
-        known_services = self._services_by_project.get(compose_project, [])
-
-        # Patterns courants pour les connexions
-        connection_patterns = [
-            r'(?:DATABASE|DB|REDIS|MONGO|POSTGRES|MYSQL|ELASTIC|RABBIT|KAFKA).*(?:HOST|URL|URI)',
-            r'.*_HOST$',
-            r'.*_URL$',
-            r'.*_URI$',
-            r'.*_SERVER$',
-            r'.*_ENDPOINT$',
-        ]
+        dependencies: list[str] = []
+        seen: set[str] = set()
+        project = self._get_project_services(compose_project)
+        if not project or project.alt_pattern is None:
+            return dependencies
 
         for key, value in environment.items():
-            if value == "***HIDDEN***":
+            # Seules les variables de connexion sont examinées
+            if not isinstance(value, str) or value == "***HIDDEN***":
+                continue
+            if not _CONNECTION_KEY_RE.match(key):
                 continue
 
-            # Vérifier si c'est une variable de connexion
-            is_connection_var = any(re.match(pattern, key, re.IGNORECASE) for pattern in connection_patterns)
-
-            if is_connection_var and isinstance(value, str):
-                # Chercher des références à d'autres services
-                for service in known_services:
-                    if service in value.lower():
-                        if service not in dependencies:
-                            dependencies.append(service)
+            # Chercher des références à d'autres services, en une passe
+            for match in project.alt_pattern.findall(value):
+                service = project.by_lower[match.lower()]
+                if service not in seen:
+                    seen.add(service)
+                    dependencies.append(service)
 
         return dependencies
 
     def _get_log_dependencies(self, container, compose_project: str, max_lines: int = 100) -> list[str]:
         """Analyse les logs récents pour détecter des connexions."""
-        dependencies = []
-        known_services = self._services_by_project.get(compose_project, [])
+        dependencies: list[str] = []
+        seen: set[str] = set()
+        project = self._get_project_services(compose_project)
 
-        if not known_services:
+        if not project or not project.names:
             return dependencies
 
         try:
-            logs = container.logs(tail=max_lines, timestamps=False).decode("utf-8", errors="ignore")
-
-            # Patterns de connexion dans les logs
-            connection_patterns = [
-                r'[Cc]onnect(?:ed|ing)?\s+to\s+(\w+)',
-                r'[Rr]esolv(?:ed|ing)?\s+(\w+)',
-                r'http[s]?://(\w+)[:/]',
-                r'@(\w+):',  # Database URLs
-            ]
-
-            for pattern in connection_patterns:
-                matches = re.findall(pattern, logs)
-                for match in matches:
-                    match_lower = match.lower()
-                    for service in known_services:
-                        if service.lower() == match_lower:
-                            if service not in dependencies:
-                                dependencies.append(service)
+            # Logs non décodés: seuls les mots capturés le sont
+            logs = container.logs(tail=max_lines, timestamps=False)
+
+            # Chaque mot capturé est résolu par une recherche dans un dict:
+            # coût linéaire en la taille des logs, indépendant du nombre de services
+            for pattern in _LOG_CONNECTION_PATTERNS:
+                for match in pattern.findall(logs):
+                    service = project.by_lower.get(match.decode("ascii").lower())
+                    if service and service not in seen:
+                        seen.add(service)
+                        dependencies.append(service)
 
         except Exception as e:
             logger.debug(f"Erreur lecture logs: {e}")
@@ -418,7 +731,8 @@ class DockerCollector:
         self,
         container_id: str,
         lines: int = 100,
-        since_seconds: int = 60
+        since_seconds: int = 60,
+        since: Optional[float] = None
     ) -> list[ContainerLogEntry]:
         """
         Récupère les derniers logs d'un container.
@@ -427,80 +741,121 @@ class DockerCollector:
             container_id: ID du container (short ou long)
             lines: Nombre de lignes max
             since_seconds: Récupérer les logs depuis N secondes
+            since: Timestamp Unix de départ (prioritaire sur since_seconds)
 
         Returns:
             Liste des entrées de log
         """
-        entries = []
-        try:
-            container = self.client.containers.get(container_id)
+        return list(self.iter_container_logs(container_id, lines, since_seconds, since))
 
+    def iter_container_logs(
+        self,
+        container_id: str,
+        lines: int = 100,
+        since_seconds: int = 60,
+        since: Optional[float] = None
+    ) -> Iterator[ContainerLogEntry]:
+        """
+        Comme get_container_logs, mais produit les entrées une à une sans
+        construire la liste (réponses du command server écrites au fil de l'eau).
+        """
+        try:
             # Calculer le timestamp "since"
-            since_timestamp = int(datetime.utcnow().timestamp()) - since_seconds
-
-            # Récupérer les logs avec timestamps
-            logs_stdout = container.logs(
-                stdout=True,
-                stderr=False,
-                tail=lines,
-                since=since_timestamp,
-                timestamps=True,
-                stream=False
-            )
-            logs_stderr = container.logs(
-                stdout=False,
-                stderr=True,
-                tail=lines,
-                since=since_timestamp,
-                timestamps=True,
-                stream=False
-            )
-
-            # Parser les logs stdout
-            for line in logs_stdout.decode("utf-8", errors="ignore").split("\n"):
-                if not line.strip():
-                    continue
-                entry = self._parse_log_line(container_id, line, "stdout")
-                if entry:
-                    entries.append(entry)
-
-            # Parser les logs stderr
-            for line in logs_stderr.decode("utf-8", errors="ignore").split("\n"):
-                if not line.strip():
-                    continue
-                entry = self._parse_log_line(container_id, line, "stderr")
-                if entry:
-                    entries.append(entry)
+            since_timestamp = since if since is not None else int(time.time()) - since_seconds
+            frames = self._fetch_log_frames(container_id, lines, since_timestamp)
+
+            # Découpage directement sur les bytes: seul le message est décodé
+            for stream, payload in frames:
+                for line in payload.splitlines():
+                    if not line.strip():
+                        continue
+                    entry = self._parse_log_line(container_id, line, stream)
+                    if entry:
+                        yield entry
 
         except docker.errors.NotFound:
             logger.debug(f"Container {container_id} not found for logs")
-        except Exception as e:
+        except (APIError, RequestException) as e:
             logger.debug(f"Erreur récupération logs {container_id}: {e}")
+        except Exception as e:
+            logger.warning(f"Erreur inattendue récupération logs {container_id}: {e}")
 
-        return entries
+    def _fetch_log_frames(
+        self,
+        container_id: str,
+        lines: int,
+        since_timestamp: float
+    ) -> list[tuple[str, bytes]]:
+        """
+        Récupère les logs bruts d'un container, découpés par flux (stdout/stderr).
+
+        stdout et stderr en un seul appel: container.logs() fusionne les trames
+        sans garder leur flux, la réponse brute est démultiplexée ici. Cet appel
+        passe par des helpers privés de docker-py; s'ils changent, on repasse
+        sur deux appels publics (un par flux).
+        """
+        api = self.client.api
+        params = {"timestamps": True, "tail": lines, "since": since_timestamp}
+
+        if self._raw_logs_api:
+            try:
+                # Le mode TTY (pas de multiplexage) est connu depuis le dernier
+                # inspect, sinon il faut inspecter le container
+                tty = self._container_tty.get(container_id)
+                if tty is None:
+                    tty = bool(api.inspect_container(container_id)["Config"].get("Tty"))
+
+                response = api._get(
+                    api._url("/containers/{0}/logs", container_id),
+                    params={
+                        "stdout": 1,
+                        "stderr": 1,
+                        "timestamps": 1,
+                        "tail": lines,
+                        "since": since_timestamp,
+                    },
+                )
+                raw_logs = api._result(response, binary=True)
+                return [("stdout", raw_logs)] if tty else _demux_log_frames(raw_logs)
+            except (APIError, RequestException):
+                # Erreurs du daemon ou du transport: gérées par l'appelant
+                raise
+            except Exception as e:
+                logger.warning(
+                    f"Appel brut des logs Docker indisponible ({type(e).__name__}: {e}), "
+                    f"utilisation de l'API publique"
+                )
+                self._raw_logs_api = False
+
+        return [
+            ("stdout", api.logs(container_id, stdout=True, stderr=False, **params)),
+            ("stderr", api.logs(container_id, stdout=False, stderr=True, **params)),
+        ]
 
     def _parse_log_line(
         self,
         container_id: str,
-        line: str,
+        line: bytes,
         stream: str
     ) -> Optional[ContainerLogEntry]:
-        """Parse une ligne de log Docker avec timestamp."""
+        """Parse une ligne de log Docker (bytes) avec timestamp."""
         try:
             # Format Docker: "2024-01-15T10:30:45.123456789Z message"
             # Le timestamp est séparé du message par un espace
-            parts = line.split(" ", 1)
-            if len(parts) >= 2:
-                timestamp = parts[0]
-                message = parts[1]
+            sep = line.find(b" ")
+            if sep > 0:
+                timestamp = line[:sep].decode("ascii", errors="ignore")
+                message_bytes = line[sep + 1:]
             else:
                 # Pas de timestamp, utiliser maintenant
                 timestamp = datetime.utcnow().isoformat() + "Z"
-                message = line
+                message_bytes = line
 
-            # Tronquer le message si trop long
-            if len(message) > 5000:
-                message = message[:5000] + "..."
+            # Tronquer le message si trop long (avant décodage)
+            if len(message_bytes) > 5000:
+                message = message_bytes[:5000].decode("utf-8", errors="ignore") + "..."
+            else:
+                message = message_bytes.decode("utf-8", errors="ignore")
 
             return ContainerLogEntry(
                 container_id=container_id,
@@ -521,33 +876,115 @@ class DockerCollector:
         """
         Collecte les logs de tous les containers running.
 
+        Seuls les logs postérieurs à la dernière ligne déjà collectée sont
+        récupérés; since_seconds ne sert qu'à la première collecte d'un container.
+
         Args:
             containers: Liste des containers
             lines: Nombre de lignes par container
-            since_seconds: Logs depuis N secondes
+            since_seconds: Logs depuis N secondes (première collecte)
 
         Returns:
             Liste de toutes les entrées de log
         """
         all_logs = []
-
-        for container in containers:
-            # Ne collecter que les containers running
-            if container.status != ContainerStatus.RUNNING:
-                continue
-
-            logs = self.get_container_logs(
-                container.id,
+        default_since = time.time() - since_seconds
+        # Ne collecter que les containers running (statut déjà connu, pas d'appel API)
+        running = [c for c in containers if c.status == ContainerStatus.RUNNING]
+        running_ids = {c.id for c in running}
+
+        # Un appel HTTP par container: lancés en parallèle dans le pool
+        results = self._executor.map(
+            lambda c: self.get_container_logs(
+                c.id,
                 lines=lines,
-                since_seconds=since_seconds
-            )
+                since=self._last_log_ts.get(c.id, default_since)
+            ),
+            running,
+        )
+
+        for container, logs in zip(running, results):
             all_logs.extend(logs)
 
-        logger.debug(f"Collecté {len(all_logs)} lignes de logs de {len(containers)} containers")
+            last_ts = self._latest_log_timestamp(logs)
+            if last_ts is not None:
+                # Docker inclut la borne "since": repartir juste après la dernière ligne
+                self._last_log_ts[container.id] = last_ts + 1e-6
+
+        # Oublier les containers qui ne tournent plus
+        for container_id in self._last_log_ts.keys() - running_ids:
+            del self._last_log_ts[container_id]
+
+        logger.debug(f"Collecté {len(all_logs)} lignes de logs de {len(running)} containers")
         return all_logs
 
+    @staticmethod
+    def _latest_log_timestamp(entries: list[ContainerLogEntry]) -> Optional[float]:
+        """Retourne le timestamp Unix le plus récent d'une liste d'entrées de log."""
+        latest = None
+        for entry in entries:
+            try:
+                ts = _parse_iso_datetime(entry.timestamp).timestamp()
+            except ValueError:
+                continue
+            if latest is None or ts > latest:
+                latest = ts
+        return latest
+
+    def _ensure_stat_stream(self, container_id: str):
+        """Démarre la lecture continue des stats d'un container si besoin."""
+        if container_id in self._stat_threads or self._closed:
+            return
+        thread = threading.Thread(
+            target=self._read_stat_stream,
+            args=(container_id,),
+            name=f"docker-stats-{container_id}",
+            daemon=True,
+        )
+        self._stat_threads[container_id] = thread
+        thread.start()
+
+    def _read_stat_stream(self, container_id: str):
+        """
+        Garde le dernier échantillon du flux de stats (un par seconde).
+
+        Les échantillons sont conservés bruts: seul celui lu au moment de la
+        collecte est décodé, les autres sont simplement remplacés.
+        """
+        thread = threading.current_thread()
+        buffer = b""
+        try:
+            for chunk in self.client.api.stats(container_id, stream=True, decode=False):
+                # Flux abandonné (container arrêté ou collecteur fermé)
+                if self._closed or self._stat_threads.get(container_id) is not thread:
+                    return
+                # dockerd termine chaque document JSON par un saut de ligne
+                buffer += chunk
+                if b"\n" not in buffer:
+                    continue
+                *documents, buffer = buffer.split(b"\n")
+                for document in reversed(documents):
+                    if document.strip():
+                        self._latest_stats[container_id] = document
+                        break
+        except Exception as e:
+            logger.debug(f"Flux de stats interrompu pour {container_id}: {e}")
+        finally:
+            # Le flux se termine quand le container s'arrête
+            if self._stat_threads.get(container_id) is thread:
+                self._drop_stat_stream(container_id)
+
+    def _drop_stat_stream(self, container_id: str):
+        """Oublie le flux de stats d'un container (le thread s'arrête au prochain échantillon)."""
+        self._stat_threads.pop(container_id, None)
+        self._latest_stats.pop(container_id, None)
+
     def close(self):
         """Ferme la connexion Docker."""
+        self._closed = True
+        if self._events_stream is not None:
+            self._events_stream.close()
+        self._executor.shutdown(wait=False, cancel_futures=True)
         self.client.close()
 
     # === Container Control Actions ===
@@ -650,37 +1087,23 @@ class DockerCollector:
     def get_container_stats(self, container_id: str) -> dict:
         """Récupère les statistiques d'un container."""
         try:
-            container = self.client.containers.get(container_id)
-            stats = container.stats(stream=False)
-
-            # Calculer CPU %
-            cpu_delta = stats["cpu_stats"]["cpu_usage"]["total_usage"] - \
-                        stats["precpu_stats"]["cpu_usage"]["total_usage"]
-            system_delta = stats["cpu_stats"]["system_cpu_usage"] - \
-                           stats["precpu_stats"]["system_cpu_usage"]
-            cpu_count = stats["cpu_stats"].get("online_cpus", 1)
-            cpu_percent = (cpu_delta / system_delta) * cpu_count * 100 if system_delta > 0 else 0
-
-            # Mémoire
-            memory_usage = stats["memory_stats"].get("usage", 0)
-            memory_limit = stats["memory_stats"].get("limit", 1)
-            memory_percent = (memory_usage / memory_limit) * 100
+            # Dernier échantillon du flux en arrière-plan s'il existe, sinon appel ponctuel
+            raw_stats = self._latest_stats.get(container_id[:12])
+            if raw_stats is not None:
+                stats = _json_loads(raw_stats)
+            else:
+                stats = self.client.api.stats(container_id, stream=False)
 
+            values = self._compute_stats(stats)
             return {
                 "success": True,
                 "stats": {
-                    "cpu_percent": round(cpu_percent, 2),
-                    "memory_usage_mb": round(memory_usage / (1024 * 1024), 2),
-                    "memory_limit_mb": round(memory_limit / (1024 * 1024), 2),
-                    "memory_percent": round(memory_percent, 2),
-                    "network_rx_bytes": sum(
-                        net.get("rx_bytes", 0)
-                        for net in stats.get("networks", {}).values()
-                    ),
-                    "network_tx_bytes": sum(
-                        net.get("tx_bytes", 0)
-                        for net in stats.get("networks", {}).values()
-                    ),
+                    "cpu_percent": round(values["cpu_percent"], 2),
+                    "memory_usage_mb": round(values["memory_used"] / (1024 * 1024), 2),
+                    "memory_limit_mb": round(values["memory_limit"] / (1024 * 1024), 2),
+                    "memory_percent": round(values["memory_percent"], 2),
+                    "network_rx_bytes": values["network_rx"],
+                    "network_tx_bytes": values["network_tx"],
                 }
             }
         except docker.errors.NotFound:
@@ -690,87 +1113,145 @@ class DockerCollector:
 
     def collect_container_metrics(self, containers: list[ContainerInfo]) -> list[ContainerMetricsReport]:
         """Collecte les métriques de tous les containers running."""
-        metrics = []
+        # Ne collecter que les containers running
+        running = [c for c in containers if c.status == ContainerStatus.RUNNING]
 
-        for container_info in containers:
-            # Ne collecter que les containers running
-            if container_info.status != ContainerStatus.RUNNING:
+        # Les stats viennent du dernier échantillon des flux en arrière-plan;
+        # seuls les containers sans échantillon (nouveaux) passent par l'API
+        metrics = []
+        missing = []
+        for container_info in running:
+            self._ensure_stat_stream(container_info.id)
+            raw_stats = self._latest_stats.get(container_info.id)
+            if raw_stats is None:
+                missing.append(container_info)
                 continue
-
             try:
-                container = self.client.containers.get(container_info.id)
-                stats = container.stats(stream=False)
-
-                # Calculer CPU %
-                cpu_percent = 0.0
-                try:
-                    cpu_delta = stats["cpu_stats"]["cpu_usage"]["total_usage"] - \
-                                stats["precpu_stats"]["cpu_usage"]["total_usage"]
-                    system_delta = stats["cpu_stats"]["system_cpu_usage"] - \
-                                   stats["precpu_stats"]["system_cpu_usage"]
-                    cpu_count = stats["cpu_stats"].get("online_cpus", 1)
-                    if system_delta > 0:
-                        cpu_percent = (cpu_delta / system_delta) * cpu_count * 100
-                except (KeyError, TypeError, ZeroDivisionError):
-                    pass
-
-                # Mémoire
-                memory_used = 0
-                memory_limit = 0
-                memory_percent = 0.0
-                try:
-                    memory_used = stats["memory_stats"].get("usage", 0)
-                    memory_limit = stats["memory_stats"].get("limit", 1)
-                    if memory_limit > 0:
-                        memory_percent = (memory_used / memory_limit) * 100
-                except (KeyError, TypeError, ZeroDivisionError):
-                    pass
-
-                # Réseau
-                network_rx = 0
-                network_tx = 0
-                try:
-                    for net in stats.get("networks", {}).values():
-                        network_rx += net.get("rx_bytes", 0)
-                        network_tx += net.get("tx_bytes", 0)
-                except (KeyError, TypeError):
-                    pass
-
-                # Block I/O
-                disk_read = 0
-                disk_write = 0
-                try:
-                    for io_entry in stats.get("blkio_stats", {}).get("io_service_bytes_recursive", []) or []:
-                        if io_entry.get("op") == "read":
-                            disk_read += io_entry.get("value", 0)
-                        elif io_entry.get("op") == "write":
-                            disk_write += io_entry.get("value", 0)
-                except (KeyError, TypeError):
-                    pass
-
-                # PIDs
-                pids = 0
-                try:
-                    pids = stats.get("pids_stats", {}).get("current", 0)
-                except (KeyError, TypeError):
-                    pass
-
-                metrics.append(ContainerMetricsReport(
-                    container_id=container_info.id,
-                    cpu_percent=round(cpu_percent, 2),
-                    memory_used=int(memory_used / (1024 * 1024)),  # MB
-                    memory_limit=int(memory_limit / (1024 * 1024)),  # MB
-                    memory_percent=round(memory_percent, 2),
-                    network_rx_bytes=network_rx,
-                    network_tx_bytes=network_tx,
-                    disk_read_bytes=disk_read,
-                    disk_write_bytes=disk_write,
-                    pids=pids,
-                ))
-
-            except docker.errors.NotFound:
-                logger.debug(f"Container {container_info.id} not found for metrics")
-            except Exception as e:
-                logger.debug(f"Erreur métriques container {container_info.name}: {e}")
+                stats = _json_loads(raw_stats)
+            except ValueError as e:
+                logger.debug(f"Échantillon de stats invalide pour {container_info.name}: {e}")
+                missing.append(container_info)
+                continue
+            metric = self._build_container_metrics(container_info, stats)
+            if metric is not None:
+                metrics.append(metric)
 
+        # Un appel stats(stream=False) attend deux échantillons côté dockerd (~1-2s):
+        # les requêtes sont lancées en parallèle, bornées par la taille du pool
+        futures = [self._executor.submit(self._collect_one_container_metrics, c) for c in missing]
+        try:
+            for future in as_completed(futures, timeout=self.STATS_TIMEOUT):
+                metric = future.result()
+                if metric is not None:
+                    metrics.append(metric)
+        except FuturesTimeoutError:
+            pending = [f for f in futures if f.cancel() or not f.done()]
+            logger.warning(f"Stats non reçues à temps pour {len(pending)} container(s)")
         return metrics
+
+    def _collect_one_container_metrics(self, container_info: ContainerInfo) -> Optional[ContainerMetricsReport]:
+        """Collecte les métriques d'un container via un appel stats ponctuel."""
+        try:
+            # API bas niveau: évite l'inspect de containers.get()
+            stats = self.client.api.stats(container_info.id, stream=False)
+        except docker.errors.NotFound:
+            logger.debug(f"Container {container_info.id} not found for metrics")
+            return None
+        except Exception as e:
+            logger.debug(f"Erreur métriques container {container_info.name}: {e}")
+            return None
+
+        return self._build_container_metrics(container_info, stats)
+
+    @staticmethod
+    def _compute_stats(stats: dict) -> dict:
+        """Calcule CPU, mémoire, réseau, I/O disque et PIDs depuis un échantillon de stats."""
+        # Calculer CPU %
+        cpu_percent = 0.0
+        try:
+            cpu_delta = stats["cpu_stats"]["cpu_usage"]["total_usage"] - \
+                        stats["precpu_stats"]["cpu_usage"]["total_usage"]
+            system_delta = stats["cpu_stats"]["system_cpu_usage"] - \
+                           stats["precpu_stats"]["system_cpu_usage"]
+            cpu_count = stats["cpu_stats"].get("online_cpus", 1)
+            if system_delta > 0:
+                cpu_percent = (cpu_delta / system_delta) * cpu_count * 100
+        except (KeyError, TypeError, ZeroDivisionError):
+            pass
+
+        # Mémoire
+        memory_used = 0
+        memory_limit = 0
+        memory_percent = 0.0
+        try:
+            memory_used = stats["memory_stats"].get("usage", 0)
+            memory_limit = stats["memory_stats"].get("limit", 1)
+            if memory_limit > 0:
+                memory_percent = (memory_used / memory_limit) * 100
+        except (KeyError, TypeError, ZeroDivisionError):
+            pass
+
+        # Réseau
+        network_rx = 0
+        network_tx = 0
+        try:
+            for net in (stats.get("networks") or {}).values():
+                network_rx += net.get("rx_bytes", 0)
+                network_tx += net.get("tx_bytes", 0)
+        except (KeyError, TypeError):
+            pass
+
+        # Block I/O
+        disk_read = 0
+        disk_write = 0
+        try:
+            # "Read"/"Write" en cgroup v1, "read"/"write" en cgroup v2
+            for io_entry in stats.get("blkio_stats", {}).get("io_service_bytes_recursive", ()) or ():
+                op = io_entry.get("op")
+                if op == "read" or op == "Read":
+                    disk_read += io_entry.get("value", 0)
+                elif op == "write" or op == "Write":
+                    disk_write += io_entry.get("value", 0)
+        except (KeyError, TypeError):
+            pass
+
+        # PIDs
+        pids = 0
+        try:
+            pids = stats.get("pids_stats", {}).get("current", 0)
+        except (KeyError, TypeError):
+            pass
+
+        return {
+            "cpu_percent": cpu_percent,
+            "memory_used": memory_used,
+            "memory_limit": memory_limit,
+            "memory_percent": memory_percent,
+            "network_rx": network_rx,
+            "network_tx": network_tx,
+            "disk_read": disk_read,
+            "disk_write": disk_write,
+            "pids": pids,
+        }
+
+    def _build_container_metrics(self, container_info: ContainerInfo, stats: dict) -> Optional[ContainerMetricsReport]:
+        """Construit le rapport de métriques à partir d'un échantillon de stats."""
+        try:
+            values = self._compute_stats(stats)
+            return ContainerMetricsReport(
+                container_id=container_info.id,
+                cpu_percent=round(values["cpu_percent"], 2),
+                memory_used=int(values["memory_used"] / (1024 * 1024)),  # MB
+                memory_limit=int(values["memory_limit"] / (1024 * 1024)),  # MB
+                memory_percent=round(values["memory_percent"], 2),
+                network_rx_bytes=values["network_rx"],
+                network_tx_bytes=values["network_tx"],
+                disk_read_bytes=values["disk_read"],
+                disk_write_bytes=values["disk_write"],
+                pids=values["pids"],
+            )
+
+        except Exception as e:
+            logger.debug(f"Erreur métriques container {container_info.name}: {e}")
+
+        return None
@@ -2,6 +2,7 @@
 
 import logging
 import os
+import time
 
 try:
     import psutil
@@ -17,11 +18,22 @@ logger = logging.getLogger("infra-mapper-agent.metrics")
 class MetricsCollector:
     """Collecteur de métriques système de l'hôte."""
 
+    # Durée de validité de l'occupation disque (évolue lentement)
+    DISK_CACHE_TTL = 60
+
     def __init__(self):
         """Initialise le collecteur de métriques."""
         if not PSUTIL_AVAILABLE:
             logger.warning("psutil non disponible - métriques host désactivées")
         self._last_net_io = None
+        self._cpu_count = None
+        self._disk_usage = None
+        self._disk_expires = 0.0
+
+        if PSUTIL_AVAILABLE:
+            # Premier appel non bloquant: sert de référence pour le suivant
+            psutil.cpu_percent(interval=None)
+            self._cpu_count = psutil.cpu_count()
 
     def collect_host_metrics(self) -> HostMetricsReport:
         """Collecte les métriques système de l'hôte."""
@@ -29,9 +41,9 @@ class MetricsCollector:
             return HostMetricsReport()
 
         try:
-            # CPU
-            cpu_percent = psutil.cpu_percent(interval=0.1)
-            cpu_count = psutil.cpu_count()
+            # CPU: moyenne depuis l'appel précédent, sans attente
+            cpu_percent = psutil.cpu_percent(interval=None)
+            cpu_count = self._cpu_count
 
             # Load average (Unix only)
             load_1m, load_5m, load_15m = None, None, None
@@ -40,14 +52,14 @@ class MetricsCollector:
 
             # Mémoire
             mem = psutil.virtual_memory()
-            memory_total = int(mem.total / (1024 * 1024))  # MB
-            memory_used = int(mem.used / (1024 * 1024))    # MB
+            memory_total = mem.total >> 20  # MB
+            memory_used = mem.used >> 20    # MB
             memory_percent = mem.percent
 
             # Disque (partition racine)
-            disk = psutil.disk_usage('/')
-            disk_total = int(disk.total / (1024 * 1024))   # MB
-            disk_used = int(disk.used / (1024 * 1024))     # MB
+            disk = self._get_disk_usage()
+            disk_total = disk.total >> 20   # MB
+            disk_used = disk.used >> 20     # MB
             disk_percent = disk.percent
 
             # Réseau (total toutes interfaces)
@@ -74,3 +86,11 @@ class MetricsCollector:
         except Exception as e:
             logger.error(f"Erreur collecte métriques host: {e}")
             return HostMetricsReport()
+
+    def _get_disk_usage(self):
+        """Occupation de la partition racine, relue au plus toutes les DISK_CACHE_TTL secondes."""
+        now = time.monotonic()
+        if self._disk_usage is None or now >= self._disk_expires:
+            self._disk_usage = psutil.disk_usage('/')
+            self._disk_expires = now + self.DISK_CACHE_TTL
+        return self._disk_usage
@@ -4,107 +4,173 @@ import subprocess
 import re
 import os
 import logging
-import struct
 import socket
-from typing import Optional
+import time
+from typing import Iterator, Optional
 
 from models import NetworkConnection
 
 logger = logging.getLogger(__name__)
 
+# Octet hex de /proc/net ("7F", "7f") -> décimal ("127")
+_HEX_OCTETS = {}
+for _i in range(256):
+    _HEX_OCTETS[b"%02X" % _i] = _HEX_OCTETS[b"%02x" % _i] = str(_i)
+del _i
+
+# Marqueur d'absence dans le cache des connexions (None = ligne ignorée)
+_UNSET = object()
+
+
+def _read_small_file(path: str, size: int = 8192) -> bytes:
+    """
+    Lit un petit fichier (/proc) en bytes avec os.read, sans objet fichier
+    Python ni décodage: un seul read() suffit dans le cas courant.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        data = os.read(fd, size)
+        if len(data) == size:
+            # Plus grand que prévu: lire la suite
+            chunks = [data]
+            while chunk := os.read(fd, size):
+                chunks.append(chunk)
+            data = b"".join(chunks)
+        return data
+    finally:
+        os.close(fd)
+
 
 class NetworkCollector:
     """Collecte les connexions réseau actives via /proc/net et ss."""
 
-    # États TCP (de /proc/net/tcp)
+    # États TCP (de /proc/net/tcp, lu en bytes)
     TCP_STATES = {
-        '01': 'ESTAB',
-        '02': 'SYN-SENT',
-        '03': 'SYN-RECV',
-        '04': 'FIN-WAIT-1',
-        '05': 'FIN-WAIT-2',
-        '06': 'TIME-WAIT',
-        '07': 'CLOSE',
-        '08': 'CLOSE-WAIT',
-        '09': 'LAST-ACK',
-        '0A': 'LISTEN',
-        '0B': 'CLOSING',
+        b'01': 'ESTAB',
+        b'02': 'SYN-SENT',
+        b'03': 'SYN-RECV',
+        b'04': 'FIN-WAIT-1',
+        b'05': 'FIN-WAIT-2',
+        b'06': 'TIME-WAIT',
+        b'07': 'CLOSE',
+        b'08': 'CLOSE-WAIT',
+        b'09': 'LAST-ACK',
+        b'0A': 'LISTEN',
+        b'0B': 'CLOSING',
     }
 
-    def __init__(self):
-        """Initialise le collecteur réseau."""
+    # ID de container dans /proc/<pid>/cgroup (cgroup v1, systemd, containerd)
+    _CGROUP_RE = re.compile(
+        rb'/docker/([a-f0-9]{12,64})'
+        rb'|docker-([a-f0-9]{12,64})\.scope'
+        rb'|/containerd/([a-f0-9]{12,64})'
+    )
+
+    # Sortie de ss: adresse IPv6 "[::1]:port" et processus users:(("nom",pid=N,fd=M))
+    _IPV6_ADDR_RE = re.compile(r'\[([^\]]+)\]:(\d+)')
+    _SS_PID_RE = re.compile(r'pid=(\d+)')
+    _SS_NAME_RE = re.compile(r'\("([^"]+)"')
+
+    # Durée de validité du container associé à un PID (un PID réutilisé par
+    # un autre process peut rester mal attribué au plus cette durée)
+    PID_CACHE_TTL = 30
+
+    # Tampon de lecture des tables /proc/net: le noyau remplit le tampon en un
+    # seul read(), une table de quelques centaines de connexions tient en un appel
+    PROC_NET_BUFFER_SIZE = 64 * 1024
+
+    # États TCP écartés dès la lecture, avant le parsing des adresses: les
+    # sockets en écoute ne sont pas des connexions (le backend les ignore)
+    SKIPPED_TCP_STATES = frozenset({b'0A'})
+
+    # Nombre max d'adresses hex mémorisées avant remise à zéro
+    HEX_ADDR_CACHE_SIZE = 65536
+
+    def __init__(self, skip_states: Optional[frozenset[bytes]] = None):
+        """
+        Initialise le collecteur réseau.
+
+        Args:
+            skip_states: États TCP (hex, ex. b'06' pour TIME-WAIT) à ignorer,
+                SKIPPED_TCP_STATES par défaut
+        """
+        self._skip_states = self.SKIPPED_TCP_STATES if skip_states is None else skip_states
         self._pid_to_container: dict[int, str] = {}
-        self._inode_to_pid: dict[int, int] = {}
+        self._pid_cache: dict[int, tuple[Optional[str], float]] = {}  # pid -> (container_id, expiration)
+        self._hex_addr_cache: dict[bytes, tuple[Optional[str], Optional[int]]] = {}  # "0100007F:0277" -> (ip, port)
+        # (local, remote, état, protocole, container) bruts -> connexion (ou None si ignorée)
+        self._connections: dict[tuple, Optional[NetworkConnection]] = {}
+        self._previous_connections: dict[tuple, Optional[NetworkConnection]] = {}
         self._build_pid_container_map()
 
+    @staticmethod
+    def _iter_pids() -> Iterator[str]:
+        """
+        Itère sur les répertoires de PID de /proc, sans construire de liste.
+
+        /proc ne liste que les leaders de groupe de threads (les threads sont
+        sous /proc/<pid>/task): un fichier cgroup est lu par process, pas par
+        thread.
+        """
+        with os.scandir("/proc") as entries:
+            for entry in entries:
+                name = entry.name
+                if name[0].isdigit() and name.isdigit():
+                    yield name
+
     def _build_pid_container_map(self):
-        """Construit le mapping PID -> container_id via /proc/*/cgroup."""
-        self._pid_to_container = {}
+        """
+        Construit le mapping PID -> container_id via /proc/*/cgroup.
 
-        try:
-            for pid_dir in os.listdir("/proc"):
-                if not pid_dir.isdigit():
-                    continue
+        Le résultat de chaque PID (container ou non) est gardé PID_CACHE_TTL
+        secondes: seuls les nouveaux PID et les entrées expirées relisent leur
+        fichier cgroup. Les PID disparus sont oubliés.
+        """
+        now = time.monotonic()
+        pid_to_container = {}
+        pid_cache = {}
 
+        try:
+            for pid_dir in self._iter_pids():
                 pid = int(pid_dir)
-                cgroup_path = f"/proc/{pid}/cgroup"
-
-                try:
-                    with open(cgroup_path, "r") as f:
-                        content = f.read()
-
-                    patterns = [
-                        r'/docker/([a-f0-9]{12,64})',
-                        r'docker-([a-f0-9]{12,64})\.scope',
-                        r'/containerd/([a-f0-9]{12,64})',
-                    ]
-
-                    for pattern in patterns:
-                        match = re.search(pattern, content)
-                        if match:
-                            container_id = match.group(1)[:12]
-                            self._pid_to_container[pid] = container_id
-                            break
-
-                except (FileNotFoundError, PermissionError):
-                    continue
+                cached = self._pid_cache.get(pid)
+                if cached and cached[1] > now:
+                    container_id = cached[0]
+                    pid_cache[pid] = cached
+                else:
+                    try:
+                        content = _read_small_file(f"/proc/{pid}/cgroup")
+                    except OSError:
+                        # Process terminé entre-temps ou inaccessible
+                        continue
+
+                    match = self._CGROUP_RE.search(content)
+                    container_id = match.group(match.lastindex)[:12].decode("ascii") if match else None
+                    pid_cache[pid] = (container_id, now + self.PID_CACHE_TTL)
+
+                if container_id:
+                    pid_to_container[pid] = container_id
 
         except Exception as e:
             logger.debug(f"Erreur construction mapping PID->container: {e}")
 
-    def _build_inode_to_pid_map(self):
-        """Construit le mapping inode socket -> PID via /proc/*/fd."""
-        self._inode_to_pid = {}
-
-        try:
-            for pid_dir in os.listdir("/proc"):
-                if not pid_dir.isdigit():
-                    continue
-
-                pid = int(pid_dir)
-                fd_dir = f"/proc/{pid}/fd"
-
-                try:
-                    for fd in os.listdir(fd_dir):
-                        try:
-                            link = os.readlink(f"{fd_dir}/{fd}")
-                            # Format: socket:[12345]
-                            if link.startswith("socket:["):
-                                inode = int(link[8:-1])
-                                self._inode_to_pid[inode] = pid
-                        except (FileNotFoundError, PermissionError, ValueError):
-                            continue
-                except (FileNotFoundError, PermissionError):
-                    continue
-
-        except Exception as e:
-            logger.debug(f"Erreur construction mapping inode->PID: {e}")
+        self._pid_cache = pid_cache
+        self._pid_to_container = pid_to_container
 
     def collect_connections(self) -> list[NetworkConnection]:
         """Collecte toutes les connexions réseau actives."""
         # Rafraîchir le mapping PID -> container
         self._build_pid_container_map()
 
+        # Borner le cache des adresses (ports éphémères toujours nouveaux)
+        if len(self._hex_addr_cache) > self.HEX_ADDR_CACHE_SIZE:
+            self._hex_addr_cache.clear()
+
+        # Les connexions de la collecte précédente servent de cache: seules
+        # celles encore présentes sont reportées dans la nouvelle table
+        self._previous_connections = self._connections
+        self._connections = {}
+
         connections = []
 
         # Collecter les connexions de chaque container en lisant son namespace réseau
@@ -115,6 +181,9 @@ class NetworkCollector:
         host_connections = self._collect_host_connections()
         connections.extend(host_connections)
 
+        # Les connexions disparues ne sont plus référencées que par l'ancienne table
+        self._previous_connections = {}
+
         logger.debug(f"Collecte totale: {len(connections)} connexions ({len(container_connections)} container, {len(host_connections)} host)")
 
         return connections
@@ -123,14 +192,32 @@ class NetworkCollector:
         """Retourne un mapping net_namespace -> (representative_pid, container_id)."""
         netns_to_container = {}
 
+        # Les containers en network_mode: host partagent le namespace de l'hôte,
+        # déjà lu par _collect_host_connections: ne pas le lire deux fois
+        try:
+            host_net_ns = os.readlink("/proc/1/ns/net")
+        except (FileNotFoundError, PermissionError):
+            host_net_ns = None
+
+        # Les process d'un container partagent son namespace réseau: un seul
+        # readlink par container suffit, pas un par PID
+        resolved_containers = set()
+
         for pid, container_id in self._pid_to_container.items():
+            if container_id in resolved_containers:
+                continue
             try:
                 net_ns = os.readlink(f"/proc/{pid}/ns/net")
-                # Garder le premier PID trouvé pour chaque namespace
-                if net_ns not in netns_to_container:
-                    netns_to_container[net_ns] = (pid, container_id)
-            except (FileNotFoundError, PermissionError):
+            except OSError:
+                # Process terminé: essayer le PID suivant du container
+                continue
+            resolved_containers.add(container_id)
+
+            if net_ns == host_net_ns:
                 continue
+            # Garder le premier PID trouvé pour chaque namespace
+            if net_ns not in netns_to_container:
+                netns_to_container[net_ns] = (pid, container_id)
 
         return netns_to_container
 
@@ -143,20 +230,7 @@ class NetworkCollector:
 
         for net_ns, (pid, container_id) in netns_map.items():
             for protocol in ["tcp", "udp"]:
-                proc_file = f"/proc/{pid}/net/{protocol}"
-                try:
-                    with open(proc_file, "r") as f:
-                        lines = f.readlines()[1:]  # Skip header
-
-                    for line in lines:
-                        conn = self._parse_proc_net_line(line, protocol, container_id)
-                        if conn:
-                            connections.append(conn)
-
-                except (FileNotFoundError, PermissionError):
-                    continue
-                except Exception as e:
-                    logger.debug(f"Erreur parsing {proc_file}: {e}")
+                self._read_proc_net(pid, protocol, container_id, connections)
 
         return connections
 
@@ -164,90 +238,156 @@ class NetworkCollector:
         """Collecte les connexions du namespace réseau de l'hôte."""
         connections = []
 
-        # Utiliser PID 1 (init) pour accéder au namespace de l'hôte
+        # Utiliser PID 1 (init) pour accéder au namespace de l'hôte.
+        # Pour les connexions hôte, pas de container_id
         for protocol in ["tcp", "udp"]:
-            proc_file = f"/proc/1/net/{protocol}"
-            try:
-                with open(proc_file, "r") as f:
-                    lines = f.readlines()[1:]
+            self._read_proc_net(1, protocol, None, connections)
 
-                for line in lines:
-                    # Pour les connexions hôte, pas de container_id
-                    conn = self._parse_proc_net_line(line, protocol, None)
+        return connections
+
+    def _read_proc_net(
+        self,
+        pid: int,
+        protocol: str,
+        container_id: Optional[str],
+        connections: list[NetworkConnection],
+    ):
+        """
+        Ajoute à connections les entrées de /proc/<pid>/net/<protocol>.
+
+        Le fichier est lu ligne par ligne: seule la ligne courante est en mémoire.
+        """
+        proc_file = f"/proc/{pid}/net/{protocol}"
+        try:
+            with open(proc_file, "rb", buffering=self.PROC_NET_BUFFER_SIZE) as f:
+                next(f, None)  # Skip header
+                for line in f:
+                    conn = self._parse_proc_net_line(line, protocol, container_id)
                     if conn:
                         connections.append(conn)
 
-            except (FileNotFoundError, PermissionError):
-                continue
-            except Exception as e:
-                logger.debug(f"Erreur parsing {proc_file}: {e}")
-
-        return connections
+        except (FileNotFoundError, PermissionError):
+            return
+        except Exception as e:
+            logger.debug(f"Erreur parsing {proc_file}: {e}")
 
-    def _parse_proc_net_line(self, line: str, protocol: str, container_id: Optional[str] = None) -> Optional[NetworkConnection]:
-        """Parse une ligne de /proc/net/tcp ou /proc/net/udp."""
+    def _parse_proc_net_line(self, line: bytes, protocol: str, container_id: Optional[str] = None) -> Optional[NetworkConnection]:
+        """Parse une ligne (bytes) de /proc/net/tcp ou /proc/net/udp."""
         try:
-            parts = line.split()
-            if len(parts) < 10:
+            # Seules les 4 premières colonnes sont utiles: ne pas découper le reste
+            parts = line.split(None, 4)
+            if len(parts) < 5:
                 return None
 
             # Format: sl local_address rem_address st tx_queue:rx_queue tr:tm->when retrnsmt uid timeout inode
-            local_addr = parts[1]
-            remote_addr = parts[2]
             state_hex = parts[3]
-
-            # Parser les adresses (format hex: IP:PORT)
-            local_ip, local_port = self._parse_hex_address(local_addr)
-            remote_ip, remote_port = self._parse_hex_address(remote_addr)
-
-            if not local_ip:
-                return None
-
-            # Ignorer les connexions localhost internes (127.0.0.11 est le DNS Docker)
-            if local_ip.startswith("127.") and remote_ip and remote_ip.startswith("127."):
+            if protocol == "tcp" and state_hex in self._skip_states:
                 return None
 
-            # Convertir l'état
-            state = self.TCP_STATES.get(state_hex, state_hex) if protocol == "tcp" else "UNCONN"
+            local_addr = parts[1]
+            remote_addr = parts[2]
 
-            return NetworkConnection(
-                protocol=protocol,
-                local_ip=local_ip,
-                local_port=local_port,
-                remote_ip=remote_ip or "0.0.0.0",
-                remote_port=remote_port or 0,
-                state=state,
-                pid=None,  # Pas de PID car on lit directement le namespace
-                process_name=None,
-                container_id=container_id,
-            )
+            # Connexion déjà vue (cette collecte ou la précédente): NetworkConnection
+            # est immuable, l'objet est réutilisé sans rien décoder ni revalider
+            key = (local_addr, remote_addr, state_hex, protocol, container_id)
+            connections = self._connections
+            if key in connections:
+                return connections[key]
+            conn = self._previous_connections.get(key, _UNSET)
+            if conn is _UNSET:
+                conn = self._build_proc_net_connection(local_addr, remote_addr, state_hex, protocol, container_id)
+            connections[key] = conn
+            return conn
 
         except Exception as e:
             logger.debug(f"Erreur parsing ligne /proc/net: {e}")
             return None
 
-    def _parse_hex_address(self, hex_addr: str) -> tuple[Optional[str], Optional[int]]:
+    def _build_proc_net_connection(
+        self,
+        local_addr: bytes,
+        remote_addr: bytes,
+        state_hex: bytes,
+        protocol: str,
+        container_id: Optional[str],
+    ) -> Optional[NetworkConnection]:
+        """Construit la connexion d'une ligne /proc/net jamais vue (None si ignorée)."""
+        # Parser les adresses (format hex: IP:PORT). Les mêmes adresses
+        # reviennent d'une ligne et d'une collecte à l'autre: résultat mémorisé
+        addr_cache = self._hex_addr_cache
+        local = addr_cache.get(local_addr)
+        if local is None:
+            local = addr_cache[local_addr] = self._parse_hex_address(local_addr)
+        remote = addr_cache.get(remote_addr)
+        if remote is None:
+            remote = addr_cache[remote_addr] = self._parse_hex_address(remote_addr)
+        local_ip, local_port = local
+        remote_ip, remote_port = remote
+
+        if not local_ip:
+            return None
+
+        # Ignorer les connexions localhost internes (127.0.0.11 est le DNS Docker)
+        if local_ip.startswith("127.") and remote_ip and remote_ip.startswith("127."):
+            return None
+
+        # Convertir l'état
+        if protocol == "tcp":
+            state = self.TCP_STATES.get(state_hex) or state_hex.decode("ascii", errors="replace")
+        else:
+            state = "UNCONN"
+
+        # Valeurs produites ici (str/int déjà typés): pas de validation pydantic
+        return NetworkConnection.model_construct(
+            protocol=protocol,
+            local_ip=local_ip,
+            local_port=local_port,
+            remote_ip=remote_ip or "0.0.0.0",
+            remote_port=remote_port or 0,
+            state=state,
+            pid=None,  # Pas de PID car on lit directement le namespace
+            process_name=None,
+            container_id=container_id,
+        )
+
+    def _parse_hex_address(self, hex_addr: bytes) -> tuple[Optional[str], Optional[int]]:
         """Parse une adresse au format hex (IP:PORT) de /proc/net."""
         try:
-            ip_hex, port_hex = hex_addr.split(":")
-            port = int(port_hex, 16)
+            if len(hex_addr) == 13:
+                # IPv4 "0100007F:0277": octets en little-endian, convertis par table
+                octets = _HEX_OCTETS
+                ip = f"{octets[hex_addr[6:8]]}.{octets[hex_addr[4:6]]}.{octets[hex_addr[2:4]]}.{octets[hex_addr[0:2]]}"
+                return ip, int(hex_addr[9:13], 16)
+
+            if len(hex_addr) == 37:
+                # IPv6 (/proc/net/tcp6): 4 mots de 32 bits, chacun en little-endian
+                raw = bytes.fromhex(hex_addr[:32].decode("ascii"))
+                raw = b"".join(raw[i:i + 4][::-1] for i in range(0, 16, 4))
+                return socket.inet_ntop(socket.AF_INET6, raw), int(hex_addr[33:37], 16)
 
-            # Convertir l'IP hex en notation pointée (little-endian sur x86)
-            ip_int = int(ip_hex, 16)
-            ip = socket.inet_ntoa(struct.pack("<I", ip_int))
-
-            return ip, port
-        except Exception:
+            return None, None
+        except (KeyError, ValueError):
             return None, None
 
-    def _run_ss(self, protocol: str) -> list[NetworkConnection]:
-        """Exécute ss et parse les résultats."""
+    def _run_ss(self, protocol: str, with_processes: bool = False) -> list[NetworkConnection]:
+        """
+        Exécute ss et parse les résultats (repli, la lecture de /proc/net est
+        la voie principale).
+
+        Args:
+            protocol: "tcp" ou "udp"
+            with_processes: Ajouter -p pour obtenir PID et container. ss parcourt
+                alors tous les /proc/*/fd, ce qui peut prendre des secondes
+                sur un hôte chargé
+        """
         connections = []
 
         try:
-            # ss -tunap : TCP/UDP, numérique, all, processus
+            # ss -tuna[p] : TCP/UDP, numérique, all, processus si demandé
             flag = "-t" if protocol == "tcp" else "-u"
-            cmd = ["ss", flag, "-n", "-a", "-p"]
+            cmd = ["ss", flag, "-n", "-a"]
+            if with_processes:
+                cmd.append("-p")
 
             result = subprocess.run(
                 cmd,
@@ -329,7 +469,7 @@ class NetworkCollector:
         try:
             # Gérer IPv6: [::]:port ou [::1]:port
             if addr.startswith("["):
-                match = re.match(r'\[([^\]]+)\]:(\d+)', addr)
+                match = self._IPV6_ADDR_RE.match(addr)
                 if match:
                     return match.group(1), int(match.group(2))
                 return None, None
@@ -355,8 +495,8 @@ class NetworkCollector:
         """Parse les informations du processus."""
         try:
             # Format: users:(("docker-proxy",pid=1234,fd=5))
-            pid_match = re.search(r'pid=(\d+)', process_info)
-            name_match = re.search(r'\("([^"]+)"', process_info)
+            pid_match = self._SS_PID_RE.search(process_info)
+            name_match = self._SS_NAME_RE.search(process_info)
 
             pid = int(pid_match.group(1)) if pid_match else None
             name = name_match.group(1) if name_match else None
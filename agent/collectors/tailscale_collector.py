@@ -3,6 +3,7 @@
 import subprocess
 import json
 import logging
+import shutil
 from typing import Optional
 
 from models import TailscaleInfo
@@ -15,11 +16,14 @@ class TailscaleCollector:
 
     def __init__(self):
         """Initialise le collecteur Tailscale."""
-        pass
+        # Binaire résolu une seule fois; absent = plus aucun fork par la suite
+        # (installer Tailscale ensuite demande un redémarrage de l'agent)
+        self._binary = shutil.which("tailscale")
+        self._unavailable = self._binary is None
 
     def collect(self) -> Optional[TailscaleInfo]:
         """Collecte les informations Tailscale."""
-        if not self._is_tailscale_installed():
+        if self._unavailable:
             return TailscaleInfo(enabled=False)
 
         try:
@@ -30,18 +34,18 @@ class TailscaleCollector:
             # Récupérer les informations de l'hôte
             self_info = status.get("Self", {})
 
-            # Récupérer les peers
-            peers = {}
-            peer_data = status.get("Peer", {})
-            for peer_id, peer_info in peer_data.items():
-                hostname = peer_info.get("HostName", "")
-                ips = peer_info.get("TailscaleIPs", [])
-                if hostname and ips:
-                    peers[hostname] = ips[0]  # Première IP
+            # Récupérer les peers (première IP de chacun)
+            peers = {
+                hostname: ips[0]
+                for peer_info in (status.get("Peer") or {}).values()
+                if (hostname := peer_info.get("HostName")) and (ips := peer_info.get("TailscaleIPs"))
+            }
+
+            self_ips = self_info.get("TailscaleIPs")
 
             return TailscaleInfo(
                 enabled=True,
-                ip=self_info.get("TailscaleIPs", [None])[0],
+                ip=self_ips[0] if self_ips else None,
                 hostname=self_info.get("HostName"),
                 tailnet=status.get("MagicDNSSuffix", "").replace(".ts.net", ""),
                 peers=peers,
@@ -51,23 +55,11 @@ class TailscaleCollector:
             logger.error(f"Erreur lors de la collecte Tailscale: {e}")
             return TailscaleInfo(enabled=False)
 
-    def _is_tailscale_installed(self) -> bool:
-        """Vérifie si Tailscale est installé."""
-        try:
-            result = subprocess.run(
-                ["which", "tailscale"],
-                capture_output=True,
-                timeout=5
-            )
-            return result.returncode == 0
-        except Exception:
-            return False
-
     def _get_status(self) -> Optional[dict]:
         """Récupère le status Tailscale en JSON."""
         try:
             result = subprocess.run(
-                ["tailscale", "status", "--json"],
+                [self._binary, "status", "--json"],
                 capture_output=True,
                 text=True,
                 timeout=10
@@ -79,6 +71,11 @@ class TailscaleCollector:
 
             return json.loads(result.stdout)
 
+        except FileNotFoundError:
+            # Binaire supprimé depuis le démarrage
+            logger.info("Tailscale non trouvé, collecte désactivée")
+            self._unavailable = True
+            return None
         except subprocess.TimeoutExpired:
             logger.error("Timeout lors de l'exécution de tailscale status")
             return None
@@ -1,10 +1,12 @@
 """Collecteur de connexions réseau via tcpdump par conteneur."""
 
+import asyncio
 import subprocess
 import re
 import logging
 import threading
 import time
+from datetime import datetime
 from typing import Optional
 from dataclasses import dataclass
 from enum import Enum
@@ -15,6 +17,14 @@ from models import NetworkConnection
 
 logger = logging.getLogger(__name__)
 
+# Ligne de sortie tcpdump -nn -q: "... IP src.port > dst.port: tcp 0" / "...: UDP, length 32".
+# Appliqué avec match() sur chaque ligne lue: le saut de ligne final est exclu du dernier groupe
+_TCPDUMP_RE = re.compile(
+    r'[^\n]*? IP6? [^\n]*?'
+    r'(\d+\.\d+\.\d+\.\d+)\.(\d+)[^\S\n]*>[^\S\n]*(\d+\.\d+\.\d+\.\d+)\.(\d+):'
+    r'([^\n]*)'
+)
+
 
 class TcpdumpMode(str, Enum):
     """Mode de capture tcpdump."""
@@ -39,6 +49,8 @@ class TcpdumpCollector:
         capture_duration: int = 30,
         capture_interval: int = 600,  # 10 minutes
         max_packets_per_container: int = 500,
+        docker_client: Optional[docker.DockerClient] = None,
+        shared_capture: bool = False,
     ):
         """
         Initialise le collecteur tcpdump.
@@ -48,22 +60,28 @@ class TcpdumpCollector:
             capture_duration: Durée de capture en secondes (mode intermittent)
             capture_interval: Intervalle entre captures en secondes (mode intermittent)
             max_packets_per_container: Nombre max de paquets par conteneur
+            docker_client: Client Docker partagé (un client dédié est créé sinon)
+            shared_capture: Un seul tcpdump dans le namespace de l'hôte pour tous
+                les conteneurs, au lieu d'un par namespace de conteneur
         """
         self.mode = mode
         self.capture_duration = capture_duration
         self.capture_interval = capture_interval
         self.max_packets_per_container = max_packets_per_container
+        self.shared_capture = shared_capture
         self._is_available = self._check_tcpdump()
         self._last_capture_time = 0
         self._cached_connections: list[NetworkConnection] = []
         self._capture_lock = threading.Lock()
+        self._pid_cache: dict[str, tuple[datetime, int]] = {}  # container_id -> (started_at, pid)
 
         # Client Docker pour obtenir les PIDs des conteneurs
-        try:
-            self._docker_client = docker.DockerClient(base_url="unix:///var/run/docker.sock")
-        except Exception as e:
-            logger.warning(f"Impossible d'initialiser le client Docker: {e}")
-            self._docker_client = None
+        self._docker_client = docker_client
+        if self._docker_client is None:
+            try:
+                self._docker_client = docker.DockerClient(base_url="unix:///var/run/docker.sock")
+            except Exception as e:
+                logger.warning(f"Impossible d'initialiser le client Docker: {e}")
 
     def _check_tcpdump(self) -> bool:
         """Vérifie si tcpdump et nsenter sont disponibles."""
@@ -122,6 +140,14 @@ class TcpdumpCollector:
 
         with self._capture_lock:
             self._last_capture_time = time.time()
+
+            if self.shared_capture:
+                # Un seul tcpdump pour tous les conteneurs
+                all_connections = asyncio.run(self._capture_shared(containers))
+                logger.info(f"tcpdump: {len(all_connections)} connexions capturées (capture partagée)")
+                self._cached_connections = all_connections
+                return all_connections
+
             all_connections = []
 
             # Préparer les cibles de capture
@@ -136,24 +162,12 @@ class TcpdumpCollector:
                 f"{len(targets)} conteneurs, {self.capture_duration}s"
             )
 
-            # Capturer en parallèle pour tous les conteneurs
-            threads = []
-            results = {}
-
-            for target in targets:
-                t = threading.Thread(
-                    target=self._capture_container,
-                    args=(target, results)
-                )
-                threads.append(t)
-                t.start()
-
-            # Attendre la fin des captures
-            for t in threads:
-                t.join(timeout=self.capture_duration + 10)
+            # Capturer en parallèle pour tous les conteneurs, sur une seule
+            # boucle asyncio plutôt qu'un thread par conteneur
+            results = asyncio.run(self._capture_all(targets))
 
             # Collecter les résultats
-            for container_id, connections in results.items():
+            for connections in results:
                 all_connections.extend(connections)
 
             logger.info(f"tcpdump: {len(all_connections)} connexions capturées sur {len(targets)} conteneurs")
@@ -164,6 +178,7 @@ class TcpdumpCollector:
     def _prepare_targets(self, containers: list) -> list[ContainerTarget]:
         """Prépare les cibles de capture depuis les ContainerInfo."""
         targets = []
+        pid_cache = {}
 
         for container in containers:
             # Vérifier que le conteneur est running
@@ -172,9 +187,21 @@ class TcpdumpCollector:
                 if status != 'running':
                     continue
 
-            # Obtenir le PID du conteneur via docker inspect
+            # PID déjà relevé par l'inspect de DockerCollector pour ce rapport;
+            # à défaut, PID en cache tant que le conteneur n'a pas redémarré
+            # (même started_at), sinon docker inspect
             container_id = container.id
-            pid = self._get_container_pid(container_id)
+            started_at = getattr(container, 'started_at', None)
+            pid = getattr(container, 'pid', None)
+            if not pid:
+                cached = self._pid_cache.get(container_id)
+                if started_at is not None and cached and cached[0] == started_at:
+                    pid = cached[1]
+                else:
+                    pid = self._get_container_pid(container_id)
+
+            if pid and started_at is not None:
+                pid_cache[container_id] = (started_at, pid)
 
             if pid:
                 targets.append(ContainerTarget(
@@ -183,6 +210,8 @@ class TcpdumpCollector:
                     pid=pid
                 ))
 
+        # Les conteneurs arrêtés ou supprimés sortent du cache
+        self._pid_cache = pid_cache
         return targets
 
     def _get_container_pid(self, container_id: str) -> Optional[int]:
@@ -191,9 +220,9 @@ class TcpdumpCollector:
             return None
 
         try:
-            container = self._docker_client.containers.get(container_id)
-            # L'attribut attrs contient les informations détaillées
-            pid = container.attrs.get("State", {}).get("Pid", 0)
+            # API bas niveau: le JSON d'inspect sans construire d'objet Container
+            attrs = self._docker_client.api.inspect_container(container_id)
+            pid = attrs.get("State", {}).get("Pid", 0)
             if pid > 0:
                 return pid
         except docker.errors.NotFound:
@@ -202,100 +231,182 @@ class TcpdumpCollector:
             logger.debug(f"Erreur obtention PID pour {container_id}: {e}")
         return None
 
-    def _capture_container(
-        self,
-        target: ContainerTarget,
-        results: dict
-    ):
+    async def _capture_all(self, targets: list[ContainerTarget]) -> list[list[NetworkConnection]]:
+        """Lance les captures de tous les conteneurs en parallèle."""
+        return await asyncio.gather(*(self._capture_container(target) for target in targets))
+
+    def _tcpdump_args(self, max_packets: int, capture_filter: str) -> list[str]:
+        """Arguments tcpdump communs aux captures par conteneur et partagée."""
+        return [
+            "tcpdump",
+            "-i", "any",
+            "-nn",
+            "-q",
+            "-l",
+            # En-têtes seuls (cooked 20 + IPv6 40 + TCP avec options 60 octets):
+            # moins de copie noyau -> espace utilisateur qu'avec des paquets entiers
+            "-s", "128",
+            # Tampon de capture de 4 Mo pour absorber les rafales sans perte
+            "-B", "4096",
+            "-c", str(max_packets),
+            capture_filter,
+        ]
+
+    async def _capture_container(self, target: ContainerTarget) -> list[NetworkConnection]:
         """Capture le trafic d'un conteneur via nsenter."""
         connections = []
         seen = set()
 
+        def handle(match: re.Match):
+            conn = self._parse_tcpdump_match(match, target.container_id, seen)
+            if conn:
+                connections.append(conn)
+
+        # Utiliser nsenter pour entrer dans le namespace réseau du conteneur
+        # puis exécuter tcpdump
+        cmd = [
+            "nsenter",
+            "-t", str(target.pid),
+            "-n",  # Network namespace
+            *self._tcpdump_args(
+                self.max_packets_per_container,
+                # Trafic localhost écarté dans le noyau (filtre BPF), avant tout formatage
+                "(tcp or udp) and not (src net 127.0.0.0/8 and dst net 127.0.0.0/8)",
+            ),
+        ]
+
+        logger.debug(f"Capture {target.container_name} (PID {target.pid})")
+        await self._run_capture(cmd, target.container_name, handle)
+
+        if connections:
+            logger.debug(f"{target.container_name}: {len(connections)} connexions")
+
+        return connections
+
+    async def _capture_shared(self, containers: list) -> list[NetworkConnection]:
+        """
+        Capture le trafic de tous les conteneurs avec un seul tcpdump dans le
+        namespace réseau de l'hôte (l'agent tourne en network_mode: host).
+
+        Les paquets sont attribués aux conteneurs par leurs adresses IP: seul
+        le trafic qui traverse les interfaces de l'hôte (bridges, veth) est vu.
+        """
+        ip_to_container = {}
+        running = 0
+        for container in containers:
+            status = container.status.value if hasattr(container.status, 'value') else container.status
+            if status != 'running':
+                continue
+            running += 1
+            for ip in container.ip_addresses.values():
+                if ip:
+                    ip_to_container[ip] = container.id
+
+        if not ip_to_container:
+            logger.debug("Aucune adresse de conteneur à capturer")
+            return []
+
+        logger.info(
+            f"Capture tcpdump partagée ({self.mode.value}): "
+            f"{len(ip_to_container)} adresses, {self.capture_duration}s"
+        )
+
+        connections = []
+        seen_by_container: dict[str, set] = {}
+
+        def handle(match: re.Match):
+            # Un paquet entre deux conteneurs compte pour chacun d'eux, comme
+            # avec une capture par conteneur
+            for container_id in {ip_to_container.get(match.group(1)), ip_to_container.get(match.group(3))}:
+                if container_id:
+                    seen = seen_by_container.setdefault(container_id, set())
+                    conn = self._parse_tcpdump_match(match, container_id, seen)
+                    if conn:
+                        connections.append(conn)
+
+        # Filtre BPF limité aux adresses des conteneurs: le trafic propre à
+        # l'hôte ne consomme pas le budget de paquets
+        hosts = " or ".join(f"host {ip}" for ip in ip_to_container)
+        cmd = self._tcpdump_args(
+            self.max_packets_per_container * running,
+            f"(tcp or udp) and ({hosts})",
+        )
+        await self._run_capture(cmd, "hôte", handle)
+
+        return connections
+
+    async def _run_capture(self, cmd: list[str], label: str, handle):
+        """
+        Exécute une capture et passe chaque ligne reconnue par _TCPDUMP_RE à
+        handle, au fil de la capture (tcpdump -l vide sa sortie à chaque ligne)
+        au lieu de tout garder en mémoire.
+        """
         try:
-            # Utiliser nsenter pour entrer dans le namespace réseau du conteneur
-            # puis exécuter tcpdump
-            cmd = [
-                "nsenter",
-                "-t", str(target.pid),
-                "-n",  # Network namespace
-                "tcpdump",
-                "-i", "any",
-                "-nn",
-                "-q",
-                "-l",
-                "-c", str(self.max_packets_per_container),
-                "tcp or udp"
-            ]
-
-            logger.debug(f"Capture {target.container_name} (PID {target.pid})")
-
-            process = subprocess.Popen(
-                cmd,
+            # stderr n'est pas exploité: ne pas le laisser remplir un pipe
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
+                stderr=subprocess.DEVNULL,
             )
 
-            try:
-                stdout, stderr = process.communicate(timeout=self.capture_duration + 5)
-            except subprocess.TimeoutExpired:
-                process.kill()
-                stdout, stderr = process.communicate()
-
-            # Parser la sortie
-            for line in stdout.split("\n"):
-                conn = self._parse_tcpdump_line(line, target.container_id)
-                if conn:
-                    key = (conn.local_ip, conn.local_port, conn.remote_ip, conn.remote_port, conn.protocol)
-                    if key not in seen:
-                        seen.add(key)
-                        connections.append(conn)
+            async def read():
+                async for line in process.stdout:
+                    match = _TCPDUMP_RE.match(line.decode(errors="replace"))
+                    if match:
+                        handle(match)
 
-            if connections:
-                logger.debug(f"{target.container_name}: {len(connections)} connexions")
+            try:
+                # Arrêter tcpdump à l'échéance, même s'il n'écrit plus rien
+                await asyncio.wait_for(read(), timeout=self.capture_duration + 5)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                if process.returncode is None:
+                    process.kill()
+                await process.wait()
 
         except FileNotFoundError:
-            logger.warning(f"nsenter/tcpdump non trouvé pour {target.container_name}")
+            logger.warning(f"nsenter/tcpdump non trouvé pour {label}")
         except PermissionError:
-            logger.warning(f"Permission refusée pour {target.container_name}")
+            logger.warning(f"Permission refusée pour {label}")
         except Exception as e:
-            logger.debug(f"Erreur capture {target.container_name}: {e}")
+            logger.debug(f"Erreur capture {label}: {e}")
 
-        results[target.container_id] = connections
-
-    def _parse_tcpdump_line(self, line: str, container_id: str) -> Optional[NetworkConnection]:
-        """Parse une ligne de sortie tcpdump."""
-        if not line or ">" not in line:
-            return None
+    def _parse_tcpdump_match(
+        self,
+        match: re.Match,
+        container_id: str,
+        seen: set,
+    ) -> Optional[NetworkConnection]:
+        """
+        Construit la connexion d'une ligne tcpdump reconnue par _TCPDUMP_RE.
 
+        Retourne None pour les flux déjà présents dans seen (clé de
+        déduplication), sans construire de NetworkConnection. Le trafic
+        localhost est déjà écarté par le filtre de capture.
+        """
         try:
-            if " IP " not in line and " IP6 " not in line:
-                return None
+            src_ip, src_port, dst_ip, dst_port, tail = match.groups()
 
+            # Le protocole suit "dst.port:" ("tcp 0" ou "UDP, length 32")
             protocol = "tcp"
-            if "UDP" in line or "udp" in line:
+            if "UDP" in tail or "udp" in tail:
                 protocol = "udp"
 
-            # Pattern: src.port > dst.port:
-            match = re.search(r'(\d+\.\d+\.\d+\.\d+)\.(\d+)\s*>\s*(\d+\.\d+\.\d+\.\d+)\.(\d+):', line)
-            if not match:
-                return None
-
-            src_ip = match.group(1)
-            src_port = int(match.group(2))
-            dst_ip = match.group(3)
-            dst_port = int(match.group(4))
-
-            # Ignorer localhost
-            if src_ip.startswith("127.") and dst_ip.startswith("127."):
+            # Flux de NetworkConnection.dedup_key, ports encore en texte (tcpdump
+            # -nn les écrit sans zéros de tête): les doublons ne convertissent rien
+            key = (src_ip, src_port, dst_ip, dst_port, protocol)
+            if key in seen:
                 return None
+            seen.add(key)
 
-            return NetworkConnection(
+            # Valeurs déjà typées (str/int issus de la regex): pas de validation pydantic
+            return NetworkConnection.model_construct(
                 protocol=protocol,
                 local_ip=src_ip,
-                local_port=src_port,
+                local_port=int(src_port),
                 remote_ip=dst_ip,
-                remote_port=dst_port,
+                remote_port=int(dst_port),
                 state="ESTABLISHED",
                 pid=None,
                 process_name=None,
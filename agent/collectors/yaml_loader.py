@@ -0,0 +1,32 @@
+"""Chargement YAML partagé par les collecteurs, avec import différé de PyYAML."""
+
+from typing import Any
+
+_loader = None
+
+
+class YamlError(ValueError):
+    """Fichier YAML invalide."""
+
+
+def load_yaml(data: bytes) -> Any:
+    """
+    Parse un document YAML avec le loader sûr.
+
+    PyYAML n'est importé qu'au premier fichier réellement parsé: tant que les
+    fichiers compose sont servis par les caches, il n'est jamais chargé.
+
+    Raises:
+        YamlError: Si le document est invalide
+    """
+    global _loader
+    import yaml
+
+    if _loader is None:
+        # Loader C (libyaml) si PyYAML a été compilé avec, sinon loader pur Python
+        _loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+    try:
+        return yaml.load(data, Loader=_loader)
+    except yaml.YAMLError as e:
+        raise YamlError(str(e)) from e
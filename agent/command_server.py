@@ -1,19 +1,43 @@
 """Serveur HTTP pour recevoir les commandes du backend."""
 
-import json
+import hmac
 import logging
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import queue
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from threading import Thread
 from typing import Callable, Optional
 from functools import partial
 
+# orjson si disponible (réponses de logs volumineuses), sinon json standard
+try:
+    from orjson import dumps as _json_dumps, loads as _json_loads
+except ImportError:
+    import json
+
+    from json import loads as _json_loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+from models import ContainerStatus
+
 logger = logging.getLogger(__name__)
 
+# Valeur JSON de chaque statut, calculée une fois
+_STATUS_VALUES = {status: status.value for status in ContainerStatus}
+
 
 class CommandHandler(BaseHTTPRequestHandler):
     """Handler HTTP pour les commandes."""
 
-    def __init__(self, docker_collector, api_key: str, *args, **kwargs):
+    # Taille des blocs écrits sur le socket pour les réponses produites au fil de l'eau
+    STREAM_CHUNK_SIZE = 64 * 1024
+
+    # Timeout des lectures/écritures socket: une connexion inactive ne doit pas
+    # immobiliser un worker du pool (exec borne déjà sa propre durée)
+    timeout = 30
+
+    def __init__(self, docker_collector, api_key: bytes, *args, **kwargs):
         self.docker_collector = docker_collector
         self.api_key = api_key
         super().__init__(*args, **kwargs)
@@ -26,16 +50,19 @@ class CommandHandler(BaseHTTPRequestHandler):
         """Vérifie l'authentification via API key."""
         auth_header = self.headers.get("Authorization", "")
         if auth_header.startswith("Bearer "):
-            token = auth_header[7:]
-            return token == self.api_key
+            # Comparaison en temps constant (pas de fuite par le temps de réponse)
+            token = auth_header[7:].encode()
+            return hmac.compare_digest(token, self.api_key)
         return False
 
     def _send_json(self, data: dict, status: int = 200):
         """Envoie une réponse JSON."""
+        payload = _json_dumps(data)
         self.send_response(status)
         self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
         self.end_headers()
-        self.wfile.write(json.dumps(data).encode())
+        self.wfile.write(payload)
 
     def _read_json(self) -> Optional[dict]:
         """Lit le body JSON de la requête."""
@@ -44,11 +71,125 @@ class CommandHandler(BaseHTTPRequestHandler):
             return {}
         try:
             body = self.rfile.read(content_length)
-            return json.loads(body.decode())
+            return _json_loads(body)
         except Exception as e:
             logger.error(f"Erreur parsing JSON: {e}")
             return None
 
+    def _get_containers(self):
+        """Liste les conteneurs."""
+        containers = self.docker_collector.collect_containers()
+        self._send_json({
+            "containers": [
+                {
+                    "id": c.id,
+                    "name": c.name,
+                    "status": _STATUS_VALUES[c.status],
+                    "image": c.image
+                }
+                for c in containers
+            ]
+        })
+
+    def _post_start(self, body: dict):
+        """Démarre un conteneur."""
+        container_id = body.get("container_id")
+        if not container_id:
+            self._send_json({"error": "container_id required"}, 400)
+            return
+        result = self.docker_collector.start_container(container_id)
+        self._send_json(result, 200 if result.get("success") else 400)
+
+    def _post_stop(self, body: dict):
+        """Arrête un conteneur."""
+        container_id = body.get("container_id")
+        timeout = body.get("timeout", 10)
+        if not container_id:
+            self._send_json({"error": "container_id required"}, 400)
+            return
+        result = self.docker_collector.stop_container(container_id, timeout)
+        self._send_json(result, 200 if result.get("success") else 400)
+
+    def _post_restart(self, body: dict):
+        """Redémarre un conteneur."""
+        container_id = body.get("container_id")
+        timeout = body.get("timeout", 10)
+        if not container_id:
+            self._send_json({"error": "container_id required"}, 400)
+            return
+        result = self.docker_collector.restart_container(container_id, timeout)
+        self._send_json(result, 200 if result.get("success") else 400)
+
+    def _post_exec(self, body: dict):
+        """Exécute une commande dans un conteneur."""
+        container_id = body.get("container_id")
+        command = body.get("command")
+        timeout = body.get("timeout", 30)
+        workdir = body.get("workdir")
+        if not container_id or not command:
+            self._send_json({"error": "container_id and command required"}, 400)
+            return
+        result = self.docker_collector.exec_container(
+            container_id, command, timeout, workdir
+        )
+        self._send_json(result, 200 if result.get("success") else 400)
+
+    def _post_stats(self, body: dict):
+        """Retourne les statistiques d'un conteneur."""
+        container_id = body.get("container_id")
+        if not container_id:
+            self._send_json({"error": "container_id required"}, 400)
+            return
+        result = self.docker_collector.get_container_stats(container_id)
+        self._send_json(result, 200 if result.get("success") else 400)
+
+    def _post_logs(self, body: dict):
+        """Retourne les logs d'un conteneur."""
+        container_id = body.get("container_id")
+        lines = body.get("lines", 100)
+        since_seconds = body.get("since_seconds", 300)
+        if not container_id:
+            self._send_json({"error": "container_id required"}, 400)
+            return
+        logs = self.docker_collector.iter_container_logs(
+            container_id, lines, since_seconds
+        )
+
+        # Même document JSON qu'avec _send_json, mais écrit au fil des entrées:
+        # ni liste de dicts ni document complet en mémoire. Sans Content-Length,
+        # la fin de la réponse est marquée par la fermeture de la connexion
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        buffer = bytearray(b'{"success":true,"logs":[')
+        separator = b""
+        for log in logs:
+            buffer += separator
+            buffer += _json_dumps({
+                "timestamp": log.timestamp,
+                "stream": log.stream,
+                "message": log.message
+            })
+            separator = b","
+            if len(buffer) >= self.STREAM_CHUNK_SIZE:
+                self.wfile.write(buffer)
+                buffer.clear()
+        buffer += b"]}"
+        self.wfile.write(buffer)
+
+    # Routes: chemin -> handler (une recherche dans un dict par requête)
+    _GET_ROUTES = {
+        "/containers": _get_containers,
+    }
+    _POST_ROUTES = {
+        "/containers/start": _post_start,
+        "/containers/stop": _post_stop,
+        "/containers/restart": _post_restart,
+        "/containers/exec": _post_exec,
+        "/containers/stats": _post_stats,
+        "/containers/logs": _post_logs,
+    }
+
     def do_GET(self):
         """Handle GET requests."""
         if self.path == "/health":
@@ -59,22 +200,11 @@ class CommandHandler(BaseHTTPRequestHandler):
             self._send_json({"error": "Unauthorized"}, 401)
             return
 
-        if self.path == "/containers":
-            containers = self.docker_collector.collect_containers()
-            self._send_json({
-                "containers": [
-                    {
-                        "id": c.id,
-                        "name": c.name,
-                        "status": c.status.value,
-                        "image": c.image
-                    }
-                    for c in containers
-                ]
-            })
+        handler = self._GET_ROUTES.get(self.path)
+        if handler is None:
+            self._send_json({"error": "Not found"}, 404)
             return
-
-        self._send_json({"error": "Not found"}, 404)
+        handler(self)
 
     def do_POST(self):
         """Handle POST requests."""
@@ -87,83 +217,48 @@ class CommandHandler(BaseHTTPRequestHandler):
             self._send_json({"error": "Invalid JSON"}, 400)
             return
 
-        # Container actions
-        if self.path == "/containers/start":
-            container_id = body.get("container_id")
-            if not container_id:
-                self._send_json({"error": "container_id required"}, 400)
-                return
-            result = self.docker_collector.start_container(container_id)
-            self._send_json(result, 200 if result.get("success") else 400)
+        handler = self._POST_ROUTES.get(self.path)
+        if handler is None:
+            self._send_json({"error": "Not found"}, 404)
             return
+        handler(self, body)
 
-        if self.path == "/containers/stop":
-            container_id = body.get("container_id")
-            timeout = body.get("timeout", 10)
-            if not container_id:
-                self._send_json({"error": "container_id required"}, 400)
-                return
-            result = self.docker_collector.stop_container(container_id, timeout)
-            self._send_json(result, 200 if result.get("success") else 400)
-            return
 
-        if self.path == "/containers/restart":
-            container_id = body.get("container_id")
-            timeout = body.get("timeout", 10)
-            if not container_id:
-                self._send_json({"error": "container_id required"}, 400)
-                return
-            result = self.docker_collector.restart_container(container_id, timeout)
-            self._send_json(result, 200 if result.get("success") else 400)
-            return
+class PooledHTTPServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer dont les requêtes sont traitées par un pool de threads borné."""
 
-        if self.path == "/containers/exec":
-            container_id = body.get("container_id")
-            command = body.get("command")
-            timeout = body.get("timeout", 30)
-            workdir = body.get("workdir")
-            if not container_id or not command:
-                self._send_json({"error": "container_id and command required"}, 400)
-                return
-            result = self.docker_collector.exec_container(
-                container_id, command, timeout, workdir
-            )
-            self._send_json(result, 200 if result.get("success") else 400)
-            return
+    # Un daemon Docker saturé ne doit pas faire exploser le nombre de threads
+    MAX_WORKERS = 8
 
-        if self.path == "/containers/stats":
-            container_id = body.get("container_id")
-            if not container_id:
-                self._send_json({"error": "container_id required"}, 400)
-                return
-            result = self.docker_collector.get_container_stats(container_id)
-            self._send_json(result, 200 if result.get("success") else 400)
-            return
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._requests: queue.SimpleQueue = queue.SimpleQueue()
+        # Threads daemon, comme ceux de ThreadingHTTPServer: une requête en cours
+        # ne bloque pas l'arrêt de l'agent
+        self._workers = [
+            Thread(target=self._worker, name=f"command-server-{i}", daemon=True)
+            for i in range(self.MAX_WORKERS)
+        ]
+        for worker in self._workers:
+            worker.start()
 
-        if self.path == "/containers/logs":
-            container_id = body.get("container_id")
-            lines = body.get("lines", 100)
-            since_seconds = body.get("since_seconds", 300)
-            if not container_id:
-                self._send_json({"error": "container_id required"}, 400)
+    def _worker(self):
+        """Traite les requêtes de la file jusqu'à la sentinelle None."""
+        while True:
+            item = self._requests.get()
+            if item is None:
                 return
-            logs = self.docker_collector.get_container_logs(
-                container_id, lines, since_seconds
-            )
-            self._send_json({
-                "success": True,
-                "logs": [
-                    {
-                        "timestamp": log.timestamp,
-                        "stream": log.stream,
-                        "message": log.message
-                    }
-                    for log in logs
-                ]
-            })
-            return
+            self.process_request_thread(*item)
+
+    def process_request(self, request, client_address):
+        """Confie la requête au pool au lieu de créer un thread par requête."""
+        self._requests.put((request, client_address))
 
-        self._send_json({"error": "Not found"}, 404)
+    def server_close(self):
+        """Ferme le socket et arrête les workers."""
+        super().server_close()
+        for _ in self._workers:
+            self._requests.put(None)
 
 
 class CommandServer:
@@ -180,13 +275,15 @@ class CommandServer:
         self.api_key = api_key
         self.host = host
         self.port = port
-        self.server: Optional[HTTPServer] = None
+        self.server: Optional[PooledHTTPServer] = None
         self.thread: Optional[Thread] = None
 
     def start(self):
         """Démarre le serveur dans un thread séparé."""
-        handler = partial(CommandHandler, self.docker_collector, self.api_key)
-        self.server = HTTPServer((self.host, self.port), handler)
+        # Clé encodée une seule fois pour tous les handlers
+        handler = partial(CommandHandler, self.docker_collector, self.api_key.encode())
+        # Une requête lente (stop, exec, stats) ne bloque pas les suivantes
+        self.server = PooledHTTPServer((self.host, self.port), handler)
         self.thread = Thread(target=self.server.serve_forever, daemon=True)
         self.thread.start()
         logger.info(f"Command server démarré sur {self.host}:{self.port}")
@@ -195,4 +292,5 @@ class CommandServer:
         """Arrête le serveur."""
         if self.server:
             self.server.shutdown()
+            self.server.server_close()
             logger.info("Command server arrêté")
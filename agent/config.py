@@ -1,5 +1,7 @@
 """Configuration de l'agent Infra-Mapper."""
 
+from functools import lru_cache
+
 from pydantic_settings import BaseSettings
 from pydantic import Field
 from typing import Optional
@@ -32,6 +34,14 @@ class AgentConfig(BaseSettings):
         default=30,
         description="Intervalle entre les scans (en secondes)"
     )
+    compress_reports: bool = Field(
+        default=True,
+        description="Compresser les rapports en gzip (désactiver si le backend ne décompresse pas les requêtes gzip)"
+    )
+    columnar_connections: bool = Field(
+        default=True,
+        description="Envoyer les connexions en colonnes (désactiver si le backend ne connaît pas connections_batch)"
+    )
 
     # Docker
     docker_socket: str = Field(
@@ -70,6 +80,10 @@ class AgentConfig(BaseSettings):
         default=500,
         description="Nombre max de paquets par conteneur"
     )
+    tcpdump_shared_capture: bool = Field(
+        default=False,
+        description="Un seul tcpdump sur l'hôte, paquets attribués par IP (ne voit pas les réseaux macvlan/overlay)"
+    )
 
     # Container logs collection
     collect_logs: bool = Field(
@@ -106,6 +120,7 @@ class AgentConfig(BaseSettings):
         env_file = ".env"
 
 
+@lru_cache
 def get_config() -> AgentConfig:
-    """Retourne la configuration de l'agent."""
+    """Retourne la configuration de l'agent (lue une seule fois par process)."""
     return AgentConfig()
@@ -1,6 +1,7 @@
 """Modèles de données pour l'agent Infra-Mapper."""
 
-from pydantic import BaseModel, Field
+from functools import cached_property
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 from datetime import datetime
 from enum import Enum
@@ -43,7 +44,15 @@ class VolumeMount(BaseModel):
 
 
 class NetworkConnection(BaseModel):
-    """Connexion réseau active."""
+    """
+    Connexion réseau active.
+
+    Construite par les collecteurs avec model_construct (sans validation):
+    les champs y sont produits déjà typés. Toute donnée d'origine externe
+    doit passer par le constructeur validé.
+    """
+    model_config = ConfigDict(frozen=True)
+
     protocol: str  # tcp, udp
     local_ip: str
     local_port: int
@@ -55,6 +64,35 @@ class NetworkConnection(BaseModel):
     container_id: Optional[str] = None
     source_method: str = "proc_net"  # proc_net, tcpdump
 
+    @cached_property
+    def dedup_key(self) -> tuple[str, int, str, int, str]:
+        """Clé de déduplication, calculée une seule fois (non sérialisée)."""
+        return (self.local_ip, self.local_port, self.remote_ip, self.remote_port, self.protocol)
+
+
+class NetworkConnectionBatch(BaseModel):
+    """
+    Connexions en colonnes (une liste par champ de NetworkConnection): les
+    noms de champs ne sont pas répétés pour chaque connexion du rapport.
+    """
+    protocol: list[str] = Field(default_factory=list)
+    local_ip: list[str] = Field(default_factory=list)
+    local_port: list[int] = Field(default_factory=list)
+    remote_ip: list[str] = Field(default_factory=list)
+    remote_port: list[int] = Field(default_factory=list)
+    state: list[str] = Field(default_factory=list)
+    pid: list[Optional[int]] = Field(default_factory=list)
+    process_name: list[Optional[str]] = Field(default_factory=list)
+    container_id: list[Optional[str]] = Field(default_factory=list)
+    source_method: list[str] = Field(default_factory=list)
+
+    @classmethod
+    def from_connections(cls, connections: list[NetworkConnection]) -> "NetworkConnectionBatch":
+        """Transpose une liste de connexions en colonnes."""
+        return cls.model_construct(
+            **{name: [getattr(c, name) for c in connections] for name in cls.model_fields}
+        )
+
 
 class ContainerInfo(BaseModel):
     """Informations sur un conteneur."""
@@ -66,6 +104,9 @@ class ContainerInfo(BaseModel):
     created: datetime
     started_at: Optional[datetime] = None
 
+    # PID du processus principal (usage local: namespaces pour tcpdump, non envoyé)
+    pid: Optional[int] = Field(default=None, exclude=True)
+
     # Réseau
     networks: list[str] = Field(default_factory=list)
     ip_addresses: dict[str, str] = Field(default_factory=dict)  # network -> ip
@@ -171,6 +212,8 @@ class AgentReport(BaseModel):
     containers: list[ContainerInfo] = Field(default_factory=list)
     networks: list[NetworkInfo] = Field(default_factory=list)
     connections: list[NetworkConnection] = Field(default_factory=list)
+    # Alternative en colonnes à connections (voir AgentConfig.columnar_connections)
+    connections_batch: Optional[NetworkConnectionBatch] = None
     container_logs: list[ContainerLogEntry] = Field(default_factory=list)
     host_metrics: Optional[HostMetricsReport] = None
     container_metrics: list[ContainerMetricsReport] = Field(default_factory=list)
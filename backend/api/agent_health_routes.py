@@ -8,6 +8,7 @@ from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db import get_db
+from db.models import AgentHealthStatus
 from services.agent_health_service import AgentHealthService
 
 logger = logging.getLogger(__name__)
@@ -162,7 +163,7 @@ async def reset_agent_stats(
 
 @router.get("")
 async def list_agents_health(
-    status: Optional[str] = None,
+    status: Optional[AgentHealthStatus] = None,
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -173,29 +174,7 @@ async def list_agents_health(
     """
     try:
         service = AgentHealthService(db)
-        summary = await service.get_agents_health_summary()
-
-        # Si un filtre de statut est spécifié
-        if status:
-            if status not in summary["by_status"]:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Invalid status. Must be one of: healthy, degraded, unhealthy, unknown"
-                )
-            agents = summary["by_status"][status]
-        else:
-            # Combiner tous les agents
-            agents = []
-            for status_agents in summary["by_status"].values():
-                agents.extend(status_agents)
-
-        return {
-            "agents": agents,
-            "total": len(agents),
-            "stats": summary["stats"],
-        }
-    except HTTPException:
-        raise
+        return await service.list_agents(status)
     except Exception as e:
         logger.error(f"Erreur liste agents: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
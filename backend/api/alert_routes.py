@@ -17,8 +17,7 @@ from models.schemas import (
     AlertRuleResponse,
     AlertResponse,
     AlertsCountResponse,
-    AlertStatus,
-    AlertSeverity,
+    AlertBatchRequest,
 )
 from services.alert_service import AlertService
 
@@ -204,8 +203,8 @@ async def delete_rule(rule_id: str, db: AsyncSession = Depends(get_db)):
 
 @router.get("", response_model=list[AlertResponse])
 async def list_alerts(
-    status: Optional[AlertStatus] = None,
-    severity: Optional[AlertSeverity] = None,
+    status: Optional[DbAlertStatus] = None,
+    severity: Optional[DbAlertSeverity] = None,
     limit: int = 100,
     offset: int = 0,
     db: AsyncSession = Depends(get_db),
@@ -213,13 +212,10 @@ async def list_alerts(
     """Liste les alertes avec filtres optionnels."""
     service = AlertService(db)
 
-    # Convertir les enums schema vers enums DB
-    db_status = DbAlertStatus(status.value) if status else None
-    db_severity = DbAlertSeverity(severity.value) if severity else None
-
+    # Les paramètres sont validés directement en enums DB (mêmes valeurs que le schéma)
     alerts = await service.get_alerts(
-        status=db_status,
-        severity=db_severity,
+        status=status,
+        severity=severity,
         limit=limit,
         offset=offset,
     )
@@ -234,6 +230,34 @@ async def count_alerts(db: AsyncSession = Depends(get_db)):
     return AlertsCountResponse(**counts)
 
 
+@router.post("/acknowledge", response_model=list[AlertResponse])
+async def acknowledge_alerts(
+    data: AlertBatchRequest,
+    user_id: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """Acquitte plusieurs alertes (IDs inconnus ignorés)."""
+    service = AlertService(db)
+    alerts = await service.acknowledge_many(data.ids, user_id)
+    return [_alert_to_response(a) for a in alerts]
+
+
+@router.post("/resolve", response_model=list[AlertResponse])
+async def resolve_alerts(data: AlertBatchRequest, db: AsyncSession = Depends(get_db)):
+    """Résout manuellement plusieurs alertes (IDs inconnus ignorés)."""
+    service = AlertService(db)
+    alerts = await service.resolve_many(data.ids)
+    return [_alert_to_response(a) for a in alerts]
+
+
+@router.post("/delete")
+async def delete_alerts(data: AlertBatchRequest, db: AsyncSession = Depends(get_db)):
+    """Supprime plusieurs alertes (IDs inconnus ignorés)."""
+    service = AlertService(db)
+    deleted_ids = await service.delete_many(data.ids)
+    return {"deleted": len(deleted_ids), "ids": deleted_ids}
+
+
 @router.get("/{alert_id}", response_model=AlertResponse)
 async def get_alert(alert_id: str, db: AsyncSession = Depends(get_db)):
     """Récupère une alerte par ID."""
@@ -3,6 +3,7 @@
 from datetime import datetime
 from typing import Optional, List
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -11,6 +12,18 @@ from db.auth_models import User, AuditActionType
 from services.audit_service import AuditService
 from api.dependencies import require_admin_or_bypass
 
+# Sérialisation JSON rapide si disponible
+try:
+    import orjson
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    import json
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
 router = APIRouter(prefix="/api/v1/audit", tags=["audit"])
 
 
@@ -39,6 +52,39 @@ class AuditLogsResponse(BaseModel):
     limit: int
 
 
+def _log_to_dict(log) -> dict:
+    """
+    Convertit une ligne de log d'audit en dict JSON (mêmes champs qu'AuditLogResponse).
+
+    Remplace la construction d'un AuditLogResponse par ligne: pas de
+    validation Pydantic, les colonnes sont déjà typées par la base.
+    """
+    return {
+        "id": log.id,
+        "timestamp": log.timestamp.isoformat() if log.timestamp else None,
+        "user_id": log.user_id,
+        "username": log.username,
+        "action": log.action.value,
+        "resource_type": log.resource_type,
+        "resource_id": log.resource_id,
+        "ip_address": log.ip_address,
+        "user_agent": log.user_agent,
+        "details": log.details or {},
+        "success": log.success,
+        "error_message": log.error_message,
+    }
+
+
+async def _stream_logs(logs: list, total: int, skip: int, limit: int):
+    """Sérialise la réponse AuditLogsResponse ligne par ligne."""
+    yield b'{"logs":['
+    separator = b""
+    for log in logs:
+        yield separator + _json_dumps(_log_to_dict(log))
+        separator = b","
+    yield b'],"total":%d,"skip":%d,"limit":%d}' % (total, skip, limit)
+
+
 @router.get("/logs", response_model=AuditLogsResponse)
 async def get_audit_logs(
     skip: int = Query(0, ge=0),
@@ -48,19 +94,23 @@ async def get_audit_logs(
     success: Optional[bool] = None,
     from_date: Optional[datetime] = None,
     to_date: Optional[datetime] = None,
+    cursor: Optional[datetime] = None,
+    cursor_id: Optional[int] = None,
     db: AsyncSession = Depends(get_db),
     current_user: Optional[User] = Depends(require_admin_or_bypass),
 ):
     """
     Récupère les logs d'audit avec filtres (admin only).
 
-    - **skip**: Nombre d'entrées à sauter (pagination)
+    - **skip**: Nombre d'entrées à sauter (pagination, ignoré avec cursor)
     - **limit**: Nombre max d'entrées à retourner
     - **action**: Filtrer par type d'action
     - **user_id**: Filtrer par ID utilisateur
     - **success**: Filtrer par succès (true/false)
     - **from_date**: Date de début (ISO format)
     - **to_date**: Date de fin (ISO format)
+    - **cursor** / **cursor_id**: Curseur de la page suivante, repris des
+      en-têtes X-Next-Cursor / X-Next-Cursor-Id de la réponse précédente
     """
     audit_service = AuditService(db)
 
@@ -83,29 +133,20 @@ async def get_audit_logs(
         success=success,
         from_date=from_date,
         to_date=to_date,
+        cursor=cursor,
+        cursor_id=cursor_id,
     )
 
-    return AuditLogsResponse(
-        logs=[
-            AuditLogResponse(
-                id=log.id,
-                timestamp=log.timestamp,
-                user_id=log.user_id,
-                username=log.username,
-                action=log.action.value,
-                resource_type=log.resource_type,
-                resource_id=log.resource_id,
-                ip_address=log.ip_address,
-                user_agent=log.user_agent,
-                details=log.details or {},
-                success=log.success,
-                error_message=log.error_message,
-            )
-            for log in logs
-        ],
-        total=total,
-        skip=skip,
-        limit=limit,
+    # Page pleine: il peut rester des logs, exposer le curseur suivant
+    headers = {}
+    if len(logs) == limit and logs[-1].timestamp:
+        headers["X-Next-Cursor"] = logs[-1].timestamp.isoformat()
+        headers["X-Next-Cursor-Id"] = str(logs[-1].id)
+
+    return StreamingResponse(
+        _stream_logs(logs, total, 0 if cursor else skip, limit),
+        media_type="application/json",
+        headers=headers,
     )
 
 
@@ -126,23 +167,10 @@ async def get_user_activity(
         limit=limit,
     )
 
-    return [
-        AuditLogResponse(
-            id=log.id,
-            timestamp=log.timestamp,
-            user_id=log.user_id,
-            username=log.username,
-            action=log.action.value,
-            resource_type=log.resource_type,
-            resource_id=log.resource_id,
-            ip_address=log.ip_address,
-            user_agent=log.user_agent,
-            details=log.details or {},
-            success=log.success,
-            error_message=log.error_message,
-        )
-        for log in logs
-    ]
+    return Response(
+        content=_json_dumps([_log_to_dict(log) for log in logs]),
+        media_type="application/json",
+    )
 
 
 @router.delete("/cleanup")
@@ -19,6 +19,9 @@ class Settings(BaseSettings):
     db_name: str = Field(default="infra_mapper")
     db_user: str = Field(default="postgres")
     db_password: str = Field(default="postgres")
+    db_pool_size: int = Field(default=20)  # Connexions gardées ouvertes
+    db_max_overflow: int = Field(default=40)  # Connexions supplémentaires en pic
+    db_pool_recycle: int = Field(default=300)  # Secondes avant recyclage d'une connexion
 
     # === Authentication ===
     auth_enabled: bool = Field(default=False)  # Activer/désactiver l'auth utilisateur
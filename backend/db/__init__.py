@@ -1,11 +1,12 @@
 """Module base de données."""
 
-from .database import get_db, init_db, engine, AsyncSessionLocal
+from .database import get_db, init_db, warm_up_pool, engine, AsyncSessionLocal
 from .models import Base, Host, Container, Connection, Network
 
 __all__ = [
     "get_db",
     "init_db",
+    "warm_up_pool",
     "engine",
     "AsyncSessionLocal",
     "Base",
@@ -1,7 +1,10 @@
 """Configuration de la base de données."""
 
+import asyncio
 from contextlib import asynccontextmanager
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.orm import declarative_base
 from typing import AsyncGenerator
 
@@ -10,11 +13,16 @@ from config import get_settings
 settings = get_settings()
 
 # Moteur async
+# pre_ping écarte les connexions coupées (redémarrage Postgres, NAT/Tailscale),
+# recycle évite de garder des connexions fermées côté serveur par inactivité.
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
-    pool_size=10,
-    max_overflow=20,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_pre_ping=True,
+    pool_recycle=settings.db_pool_recycle,
 )
 
 # Session factory
@@ -47,6 +55,15 @@ async def init_db():
         await conn.run_sync(Base.metadata.create_all)
 
 
+async def warm_up_pool():
+    """Ouvre pool_size connexions au démarrage pour que les premières requêtes n'attendent pas."""
+    async def ping():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(ping() for _ in range(settings.db_pool_size)))
+
+
 @asynccontextmanager
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     """Context manager pour obtenir une session DB (pour usage hors FastAPI)."""
@@ -11,8 +11,15 @@ from slowapi.errors import RateLimitExceeded
 from starlette.middleware.trustedhost import TrustedHostMiddleware
 
 from config import get_settings
-from middleware import SecurityHeadersMiddleware, limiter, rate_limit_exceeded_handler, MetricsMiddleware
-from db import init_db
+from middleware import (
+    SecurityHeadersMiddleware,
+    limiter,
+    rate_limit_exceeded_handler,
+    MetricsMiddleware,
+    GzipRequestMiddleware,
+    ETagMiddleware,
+)
+from db import init_db, warm_up_pool
 from db.database import get_db_session
 from api import router
 from api.auth_routes import router as auth_router
@@ -47,6 +54,11 @@ async def lifespan(app: FastAPI):
     await init_db()
     logger.info("Base de données initialisée")
 
+    try:
+        await warm_up_pool()
+    except Exception as e:
+        logger.warning(f"Préchauffage du pool de connexions échoué: {e}")
+
     # Créer l'admin initial si configuré
     if settings.auth_enabled and settings.initial_admin_password:
         try:
@@ -78,9 +90,20 @@ app = FastAPI(
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
 
+# ETag / 304 sur les listes consultées en boucle par les dashboards.
+# Ajouté en premier pour être le plus interne: MetricsMiddleware (BaseHTTPMiddleware)
+# renvoie les corps en plusieurs messages, que l'ETag traiterait comme du streaming.
+app.add_middleware(
+    ETagMiddleware,
+    path_prefixes=("/api/v1/alerts", "/api/v1/agents/health"),
+)
+
 # Metrics middleware (doit être avant les autres pour mesurer le temps total)
 app.add_middleware(MetricsMiddleware)
 
+# Décompression des corps gzip (rapports des agents)
+app.add_middleware(GzipRequestMiddleware)
+
 # Security headers middleware
 app.add_middleware(SecurityHeadersMiddleware)
 
@@ -98,6 +121,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Next-Cursor-Id"],
 )
 
 # Routes API
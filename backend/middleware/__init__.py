@@ -3,6 +3,8 @@
 from .security import SecurityHeadersMiddleware
 from .rate_limit import limiter, rate_limit_exceeded_handler, get_real_ip
 from .metrics import MetricsMiddleware, metrics_collector
+from .gzip_request import GzipRequestMiddleware
+from .etag import ETagMiddleware
 
 __all__ = [
     "SecurityHeadersMiddleware",
@@ -11,4 +13,6 @@ __all__ = [
     "get_real_ip",
     "MetricsMiddleware",
     "metrics_collector",
+    "GzipRequestMiddleware",
+    "ETagMiddleware",
 ]
@@ -0,0 +1,113 @@
+"""Middleware ETag: réponses 304 Not Modified pour les GET JSON inchangés."""
+
+import hashlib
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+def compute_etag(body: bytes) -> str:
+    """ETag fort dérivé du contenu de la réponse."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    """Indique si l'ETag figure dans un en-tête If-None-Match (comparaison faible)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class ETagMiddleware:
+    """
+    Ajoute un ETag aux réponses JSON des GET et répond 304 Not Modified
+    quand le client possède déjà la même version (If-None-Match).
+
+    Middleware ASGI pur: seules les réponses 200 JSON envoyées en un seul
+    message sont mises en tampon et hachées. Les réponses en streaming
+    (exports, plusieurs messages) sont transmises telles quelles.
+    La requête est toujours exécutée: le gain porte sur la sérialisation
+    côté client et la bande passante, pas sur la requête en base.
+    """
+
+    def __init__(self, app: ASGIApp, path_prefixes: tuple[str, ...] = ("/api/",)):
+        self.app = app
+        self.path_prefixes = path_prefixes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not scope["path"].startswith(self.path_prefixes)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = None
+        for key, value in scope["headers"]:
+            if key == b"if-none-match":
+                if_none_match = value.decode("latin-1")
+                break
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_with_etag(message: Message) -> None:
+            nonlocal start_message, passthrough
+
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                if (
+                    message["status"] != 200
+                    or not content_type.startswith("application/json")
+                    or "etag" in headers
+                ):
+                    passthrough = True
+                    await send(message)
+                    return
+                # Attendre le corps pour calculer l'ETag
+                start_message = message
+                return
+
+            if message["type"] == "http.response.body":
+                if message.get("more_body", False):
+                    # Réponse en streaming: pas d'ETag
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                body = message.get("body", b"")
+                etag = compute_etag(body)
+                headers = MutableHeaders(raw=start_message["headers"])
+                headers["ETag"] = etag
+
+                if etag_matches(etag, if_none_match):
+                    # Le client a déjà cette version: en-têtes seuls, sans corps
+                    del headers["content-length"]
+                    del headers["content-type"]
+                    await send({**start_message, "status": 304})
+                    await send({"type": "http.response.body", "body": b""})
+                    return
+
+                await send(start_message)
+                await send(message)
+                return
+
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
@@ -0,0 +1,94 @@
+"""Middleware de décompression des requêtes gzip (rapports des agents)."""
+
+import zlib
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Taille max d'un corps décompressé (protection contre les "gzip bombs")
+DEFAULT_MAX_DECOMPRESSED_SIZE = 64 * 1024 * 1024
+
+
+def decompress_gzip(data: bytes, max_size: int = DEFAULT_MAX_DECOMPRESSED_SIZE) -> bytes:
+    """
+    Décompresse un corps gzip en bornant la taille du résultat.
+
+    Raises:
+        ValueError: Si le corps décompressé dépasse max_size
+        zlib.error: Si le flux gzip est invalide ou tronqué
+    """
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    body = decompressor.decompress(data, max_size + 1)
+    if len(body) > max_size or decompressor.unconsumed_tail:
+        raise ValueError("Corps décompressé trop volumineux")
+    if not decompressor.eof:
+        raise zlib.error("Flux gzip tronqué")
+    return body
+
+
+class GzipRequestMiddleware:
+    """
+    Décompresse les requêtes envoyées avec `Content-Encoding: gzip`.
+
+    Middleware ASGI pur: le corps est décompressé puis rejoué à l'application
+    avec des en-têtes corrigés, les routes reçoivent donc du JSON standard.
+    """
+
+    def __init__(self, app: ASGIApp, max_size: int = DEFAULT_MAX_DECOMPRESSED_SIZE):
+        self.app = app
+        self.max_size = max_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = None
+        for key, value in scope["headers"]:
+            if key == b"content-encoding":
+                encoding = value.strip().lower()
+                break
+
+        if encoding != b"gzip":
+            await self.app(scope, receive, send)
+            return
+
+        # Lire le corps compressé complet
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+
+        try:
+            body = decompress_gzip(b"".join(chunks), self.max_size)
+        except ValueError as e:
+            response = JSONResponse({"detail": str(e)}, status_code=413)
+            await response(scope, receive, send)
+            return
+        except zlib.error:
+            response = JSONResponse({"detail": "Corps gzip invalide"}, status_code=400)
+            await response(scope, receive, send)
+            return
+
+        headers = [
+            (key, value)
+            for key, value in scope["headers"]
+            if key not in (b"content-encoding", b"content-length")
+        ]
+        headers.append((b"content-length", str(len(body)).encode()))
+        scope = dict(scope, headers=headers)
+
+        body_sent = False
+
+        async def receive_decompressed() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        await self.app(scope, receive_decompressed, send)
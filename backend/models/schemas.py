@@ -1,6 +1,6 @@
 """Schémas Pydantic pour l'API."""
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from typing import Optional, Literal
 from datetime import datetime
 from enum import Enum
@@ -74,6 +74,53 @@ class NetworkConnection(BaseModel):
     source_method: str = "proc_net"  # proc_net, tcpdump
 
 
+class NetworkConnectionBatch(BaseModel):
+    """Connexions en colonnes (une liste par champ de NetworkConnection) pour le transport."""
+    protocol: list[str] = Field(default_factory=list)
+    local_ip: list[str] = Field(default_factory=list)
+    local_port: list[int] = Field(default_factory=list)
+    remote_ip: list[str] = Field(default_factory=list)
+    remote_port: list[int] = Field(default_factory=list)
+    state: list[str] = Field(default_factory=list)
+    pid: list[Optional[int]] = Field(default_factory=list)
+    process_name: list[Optional[str]] = Field(default_factory=list)
+    container_id: list[Optional[str]] = Field(default_factory=list)
+    source_method: list[str] = Field(default_factory=list)
+
+    @model_validator(mode="after")
+    def _check_lengths(self) -> "NetworkConnectionBatch":
+        """Toutes les colonnes doivent avoir la même longueur."""
+        lengths = {len(getattr(self, name)) for name in self.model_fields}
+        if len(lengths) > 1:
+            raise ValueError("connection batch columns must have the same length")
+        return self
+
+    def to_connections(self) -> list[NetworkConnection]:
+        """Reconstruit les connexions ligne par ligne."""
+        # Colonnes déjà validées (types et longueurs): pas de revalidation par ligne
+        return [
+            NetworkConnection.model_construct(
+                protocol=protocol,
+                local_ip=local_ip,
+                local_port=local_port,
+                remote_ip=remote_ip,
+                remote_port=remote_port,
+                state=state,
+                pid=pid,
+                process_name=process_name,
+                container_id=container_id,
+                source_method=source_method,
+            )
+            for (
+                protocol, local_ip, local_port, remote_ip, remote_port,
+                state, pid, process_name, container_id, source_method,
+            ) in zip(
+                self.protocol, self.local_ip, self.local_port, self.remote_ip, self.remote_port,
+                self.state, self.pid, self.process_name, self.container_id, self.source_method,
+            )
+        ]
+
+
 class ContainerInfo(BaseModel):
     id: str
     name: str
@@ -174,12 +221,22 @@ class AgentReport(BaseModel):
     containers: list[ContainerInfo] = Field(default_factory=list)
     networks: list[NetworkInfo] = Field(default_factory=list)
     connections: list[NetworkConnection] = Field(default_factory=list)
+    # Connexions en colonnes (agents récents): fusionnées dans connections à la validation
+    connections_batch: Optional[NetworkConnectionBatch] = None
     container_logs: list[ContainerLogReport] = Field(default_factory=list)
     host_metrics: Optional[HostMetricsReport] = None
     container_metrics: list[ContainerMetricsReport] = Field(default_factory=list)
     agent: Optional[AgentMetadata] = None  # Métadonnées de l'agent pour le monitoring
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
+    @model_validator(mode="after")
+    def _expand_connections_batch(self) -> "AgentReport":
+        """Ajoute les connexions reçues en colonnes à connections."""
+        if self.connections_batch is not None:
+            self.connections.extend(self.connections_batch.to_connections())
+            self.connections_batch = None
+        return self
+
 
 # === Modèles de réponse API ===
 
@@ -579,6 +636,11 @@ class AlertsCountResponse(BaseModel):
     critical: int
 
 
+class AlertBatchRequest(BaseModel):
+    """Requête d'action sur plusieurs alertes."""
+    ids: list[str] = Field(..., min_length=1, max_length=1000)
+
+
 # === Modèles pour les actions sur containers ===
 
 class ContainerActionRequest(BaseModel):
@@ -4,10 +4,11 @@ import logging
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 
-from sqlalchemy import select, update
+from sqlalchemy import case, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from db.models import Host
+from db.models import AgentHealthStatus, Host
+from services.ttl_cache import AsyncTTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +19,18 @@ UNHEALTHY_THRESHOLD_FACTOR = 5.0  # Facteur pour considérer l'agent comme unhea
 MAX_CONSECUTIVE_FAILURES = 3  # Nombre d'échecs consécutifs avant dégradation
 # Rapport lent = prend plus de 90% de l'intervalle de rapport (calculé dynamiquement)
 SLOW_REPORT_THRESHOLD_FACTOR = 0.9
+# Durée de vie du résumé de santé en cache (secondes)
+HEALTH_SUMMARY_CACHE_TTL = 10
+
+# Résumé partagé par les routes /summary et liste, invalidé par les écritures
+health_summary_cache = AsyncTTLCache(ttl=HEALTH_SUMMARY_CACHE_TTL)
+
+# Ordre des agents dans la liste: par statut, comme les groupes du résumé
+_HEALTH_ORDER = case(
+    {status.value: rank for rank, status in enumerate(AgentHealthStatus)},
+    value=Host.agent_health,
+    else_=len(AgentHealthStatus) - 1,
+)
 
 
 class AgentHealthService:
@@ -203,6 +216,7 @@ class AgentHealthService:
                 })
 
         await self.db.commit()
+        health_summary_cache.invalidate()
 
         return stats
 
@@ -210,9 +224,18 @@ class AgentHealthService:
         """
         Retourne un résumé de la santé de tous les agents.
 
+        Le résultat est mis en cache HEALTH_SUMMARY_CACHE_TTL secondes et
+        partagé entre les requêtes concurrentes: il ne doit pas être modifié.
+
         Returns:
             Dict avec les statistiques et la liste des agents par statut
         """
+        return await health_summary_cache.get_or_compute(
+            "summary", self._compute_agents_health_summary
+        )
+
+    async def _compute_agents_health_summary(self) -> Dict[str, Any]:
+        """Calcule le résumé de santé depuis la base."""
         result = await self.db.execute(select(Host))
         hosts = result.scalars().all()
 
@@ -240,30 +263,8 @@ class AgentHealthService:
         agents_data = []
 
         for host in hosts:
-            expected_interval = host.report_interval or DEFAULT_REPORT_INTERVAL
-            seconds_since_last_report = (
-                (now - host.last_seen).total_seconds() if host.last_seen else float('inf')
-            )
-
-            health_status = host.agent_health or "unknown"
-            agent_info = {
-                "host_id": host.id,
-                "hostname": host.hostname,
-                "agent_version": host.agent_version,
-                "agent_health": health_status,
-                "is_online": host.is_online,
-                "last_seen": host.last_seen.isoformat() if host.last_seen else None,
-                "seconds_since_last_report": int(seconds_since_last_report),
-                "report_interval": expected_interval,
-                "reports_count": host.reports_count or 0,
-                "errors_count": host.errors_count or 0,
-                "consecutive_failures": host.consecutive_failures or 0,
-                "last_report_duration_ms": host.last_report_duration,
-                "avg_report_duration_ms": host.avg_report_duration,
-                "uptime_seconds": host.uptime_seconds,
-                "last_error": host.last_error,
-                "last_error_at": host.last_error_at.isoformat() if host.last_error_at else None,
-            }
+            agent_info = self._agent_info(host, now)
+            health_status = agent_info["agent_health"]
 
             agents_data.append(agent_info)
 
@@ -290,6 +291,76 @@ class AgentHealthService:
 
         return summary
 
+    async def list_agents(
+        self,
+        status: Optional[AgentHealthStatus] = None,
+    ) -> Dict[str, Any]:
+        """
+        Liste les agents avec leurs informations de santé.
+
+        Le filtre de statut est appliqué en SQL et les compteurs sont
+        calculés par un GROUP BY, sans construire le résumé complet.
+
+        Args:
+            status: Filtre optionnel par statut de santé
+
+        Returns:
+            Dict avec la liste des agents, leur nombre et les statistiques
+        """
+        health = func.coalesce(Host.agent_health, AgentHealthStatus.UNKNOWN.value)
+
+        query = select(Host).order_by(_HEALTH_ORDER, Host.hostname)
+        if status is not None:
+            query = query.where(health == status.value)
+        result = await self.db.execute(query)
+        hosts = result.scalars().all()
+
+        counts_result = await self.db.execute(
+            select(health, Host.is_online, func.count()).group_by(health, Host.is_online)
+        )
+        stats = {s.value: 0 for s in AgentHealthStatus}
+        stats.update(online=0, offline=0)
+        for health_status, is_online, count in counts_result.all():
+            if health_status in stats:
+                stats[health_status] += count
+            stats["online" if is_online else "offline"] += count
+
+        now = datetime.utcnow()
+        agents = [self._agent_info(host, now) for host in hosts]
+
+        return {
+            "agents": agents,
+            "total": len(agents),
+            "stats": stats,
+        }
+
+    @staticmethod
+    def _agent_info(host: Host, now: datetime) -> Dict[str, Any]:
+        """Informations de santé d'un agent pour les listes et le résumé."""
+        expected_interval = host.report_interval or DEFAULT_REPORT_INTERVAL
+        seconds_since_last_report = (
+            (now - host.last_seen).total_seconds() if host.last_seen else float('inf')
+        )
+
+        return {
+            "host_id": host.id,
+            "hostname": host.hostname,
+            "agent_version": host.agent_version,
+            "agent_health": host.agent_health or "unknown",
+            "is_online": host.is_online,
+            "last_seen": host.last_seen.isoformat() if host.last_seen else None,
+            "seconds_since_last_report": int(seconds_since_last_report),
+            "report_interval": expected_interval,
+            "reports_count": host.reports_count or 0,
+            "errors_count": host.errors_count or 0,
+            "consecutive_failures": host.consecutive_failures or 0,
+            "last_report_duration_ms": host.last_report_duration,
+            "avg_report_duration_ms": host.avg_report_duration,
+            "uptime_seconds": host.uptime_seconds,
+            "last_error": host.last_error,
+            "last_error_at": host.last_error_at.isoformat() if host.last_error_at else None,
+        }
+
     async def get_agent_health(self, host_id: str) -> Optional[Dict[str, Any]]:
         """
         Retourne les détails de santé d'un agent spécifique.
@@ -365,4 +436,5 @@ class AgentHealthService:
         host.agent_health = "unknown"
 
         await self.db.commit()
+        health_summary_cache.invalidate()
         return True
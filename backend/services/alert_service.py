@@ -6,7 +6,7 @@ import uuid
 from datetime import datetime, timedelta
 from typing import Optional
 
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, update, delete, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.models import (
@@ -22,9 +22,16 @@ from db.models import (
     HealthStatusEnum,
 )
 from services.notification_service import NotificationService
+from services.ttl_cache import AsyncTTLCache
 
 logger = logging.getLogger(__name__)
 
+# Durée de vie du comptage des alertes actives en cache (secondes)
+ALERTS_COUNT_CACHE_TTL = 10
+
+# Comptage interrogé en boucle par le dashboard, invalidé par les écritures
+alerts_count_cache = AsyncTTLCache(ttl=ALERTS_COUNT_CACHE_TTL)
+
 
 class AlertService:
     """Service de gestion des alertes."""
@@ -200,7 +207,13 @@ class AlertService:
         return await self.db.get(Alert, alert_id)
 
     async def get_active_alerts_count(self) -> dict:
-        """Compte les alertes actives par sévérité."""
+        """Compte les alertes actives par sévérité (mis en cache ALERTS_COUNT_CACHE_TTL s)."""
+        return await alerts_count_cache.get_or_compute(
+            "active", self._compute_active_alerts_count
+        )
+
+    async def _compute_active_alerts_count(self) -> dict:
+        """Compte les alertes actives depuis la base."""
         result = await self.db.execute(
             select(Alert).where(Alert.status == AlertStatus.ACTIVE)
         )
@@ -215,42 +228,68 @@ class AlertService:
 
     async def acknowledge_alert(self, alert_id: str, user_id: Optional[str] = None) -> Optional[Alert]:
         """Acquitte une alerte."""
-        alert = await self.get_alert(alert_id)
-        if not alert:
-            return None
-
-        alert.status = AlertStatus.ACKNOWLEDGED
-        alert.acknowledged_at = datetime.utcnow()
-        alert.acknowledged_by = user_id
-
-        await self.db.commit()
-        await self.db.refresh(alert)
-        logger.info(f"Alerte acquittée: {alert.id}")
-        return alert
+        alerts = await self.acknowledge_many([alert_id], user_id)
+        return alerts[0] if alerts else None
+
+    async def acknowledge_many(self, alert_ids: list[str], user_id: Optional[str] = None) -> list[Alert]:
+        """Acquitte plusieurs alertes en une seule requête UPDATE."""
+        alerts = await self._update_many(
+            alert_ids,
+            status=AlertStatus.ACKNOWLEDGED,
+            acknowledged_at=datetime.utcnow(),
+            acknowledged_by=user_id,
+        )
+        logger.info(f"Alertes acquittées: {[a.id for a in alerts]}")
+        return alerts
 
     async def resolve_alert(self, alert_id: str) -> Optional[Alert]:
         """Résout une alerte."""
-        alert = await self.get_alert(alert_id)
-        if not alert:
-            return None
+        alerts = await self.resolve_many([alert_id])
+        return alerts[0] if alerts else None
+
+    async def resolve_many(self, alert_ids: list[str]) -> list[Alert]:
+        """Résout plusieurs alertes en une seule requête UPDATE."""
+        alerts = await self._update_many(
+            alert_ids,
+            status=AlertStatus.RESOLVED,
+            resolved_at=datetime.utcnow(),
+        )
+        logger.info(f"Alertes résolues: {[a.id for a in alerts]}")
+        return alerts
+
+    async def delete_alert(self, alert_id: str) -> bool:
+        """Supprime une alerte."""
+        return bool(await self.delete_many([alert_id]))
 
-        alert.status = AlertStatus.RESOLVED
-        alert.resolved_at = datetime.utcnow()
+    async def delete_many(self, alert_ids: list[str]) -> list[str]:
+        """Supprime plusieurs alertes en une seule requête DELETE, retourne les IDs supprimés."""
+        if not alert_ids:
+            return []
 
+        result = await self.db.execute(
+            delete(Alert).where(Alert.id.in_(alert_ids)).returning(Alert.id)
+        )
+        deleted_ids = list(result.scalars().all())
         await self.db.commit()
-        await self.db.refresh(alert)
-        logger.info(f"Alerte résolue: {alert.id}")
-        return alert
+        alerts_count_cache.invalidate()
+        logger.info(f"Alertes supprimées: {deleted_ids}")
+        return deleted_ids
 
-    async def delete_alert(self, alert_id: str) -> bool:
-        """Supprime une alerte."""
-        alert = await self.get_alert(alert_id)
-        if not alert:
-            return False
+    async def _update_many(self, alert_ids: list[str], **values) -> list[Alert]:
+        """UPDATE ensembliste des alertes, retourne les alertes modifiées."""
+        if not alert_ids:
+            return []
 
-        await self.db.delete(alert)
+        result = await self.db.execute(
+            update(Alert)
+            .where(Alert.id.in_(alert_ids))
+            .values(**values)
+            .returning(Alert)
+        )
+        alerts = list(result.scalars().all())
         await self.db.commit()
-        return True
+        alerts_count_cache.invalidate()
+        return alerts
 
     async def delete_old_alerts(self, days: int = 30) -> int:
         """Supprime les alertes résolues plus anciennes que X jours."""
@@ -545,6 +584,7 @@ class AlertService:
         )
         self.db.add(alert)
         await self.db.commit()
+        alerts_count_cache.invalidate()
         await self.db.refresh(alert)
 
         logger.warning(f"Alerte créée: [{rule.severity.value}] {title}")
@@ -624,6 +664,7 @@ class AlertService:
             logger.info(f"Alerte auto-résolue: {alert.title}")
 
         await self.db.commit()
+        alerts_count_cache.invalidate()
 
     async def _resolve_container_alerts(
         self,
@@ -660,3 +701,4 @@ class AlertService:
             logger.info(f"Alerte auto-résolue: {alert.title}")
 
         await self.db.commit()
+        alerts_count_cache.invalidate()
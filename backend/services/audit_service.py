@@ -3,13 +3,29 @@
 from datetime import datetime, timedelta
 from typing import Optional, List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, and_
+from sqlalchemy import Row, select, delete, and_, tuple_
 
 from db.auth_models import AuditLog, AuditActionType
 from config import get_settings
 
 settings = get_settings()
 
+# Colonnes des listes de logs: projection en Row, sans instancier d'objets ORM
+AUDIT_LOG_COLUMNS = (
+    AuditLog.id,
+    AuditLog.timestamp,
+    AuditLog.user_id,
+    AuditLog.username,
+    AuditLog.action,
+    AuditLog.resource_type,
+    AuditLog.resource_id,
+    AuditLog.ip_address,
+    AuditLog.user_agent,
+    AuditLog.details,
+    AuditLog.success,
+    AuditLog.error_message,
+)
+
 
 class AuditService:
     """Service pour la gestion des logs d'audit."""
@@ -113,9 +129,16 @@ class AuditService:
         success: Optional[bool] = None,
         from_date: Optional[datetime] = None,
         to_date: Optional[datetime] = None,
-    ) -> tuple[List[AuditLog], int]:
+        cursor: Optional[datetime] = None,
+        cursor_id: Optional[int] = None,
+    ) -> tuple[List[Row], int]:
         """
-        Récupère les logs d'audit avec filtres.
+        Récupère les logs d'audit avec filtres (lignes AUDIT_LOG_COLUMNS).
+
+        Pagination par curseur (keyset) si cursor est fourni: retourne les
+        logs strictement antérieurs à (cursor, cursor_id) et ignore skip,
+        ce qui évite le coût O(skip) de l'OFFSET sur les pages profondes.
+        Le total porte sur les filtres, indépendamment du curseur.
 
         Returns:
             Tuple (logs, total_count)
@@ -135,14 +158,23 @@ class AuditService:
             conditions.append(AuditLog.timestamp <= to_date)
 
         # Requête pour les résultats
-        query = select(AuditLog)
+        query = select(*AUDIT_LOG_COLUMNS)
         if conditions:
             query = query.where(and_(*conditions))
-        query = query.order_by(AuditLog.timestamp.desc())
-        query = query.offset(skip).limit(limit)
+        if cursor is not None:
+            if cursor_id is not None:
+                query = query.where(
+                    tuple_(AuditLog.timestamp, AuditLog.id) < tuple_(cursor, cursor_id)
+                )
+            else:
+                query = query.where(AuditLog.timestamp < cursor)
+        else:
+            query = query.offset(skip)
+        query = query.order_by(AuditLog.timestamp.desc(), AuditLog.id.desc())
+        query = query.limit(limit)
 
         result = await self.db.execute(query)
-        logs = result.scalars().all()
+        logs = result.all()
 
         # Requête pour le count total
         from sqlalchemy import func
@@ -159,17 +191,17 @@ class AuditService:
         user_id: str,
         skip: int = 0,
         limit: int = 50,
-    ) -> List[AuditLog]:
-        """Récupère l'activité d'un utilisateur."""
+    ) -> List[Row]:
+        """Récupère l'activité d'un utilisateur (lignes AUDIT_LOG_COLUMNS)."""
         query = (
-            select(AuditLog)
+            select(*AUDIT_LOG_COLUMNS)
             .where(AuditLog.user_id == user_id)
             .order_by(AuditLog.timestamp.desc())
             .offset(skip)
             .limit(limit)
         )
         result = await self.db.execute(query)
-        return list(result.scalars().all())
+        return list(result.all())
 
     async def cleanup_old_logs(self, days: Optional[int] = None) -> int:
         """
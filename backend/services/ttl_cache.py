@@ -0,0 +1,83 @@
+"""Cache mémoire à durée de vie limitée pour les lectures agrégées des services."""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class AsyncTTLCache:
+    """
+    Cache asynchrone avec expiration (TTL) et requête unique en vol.
+
+    Les appelants concurrents pour une même clé attendent le même calcul
+    au lieu de relancer chacun la requête en base. Un compteur de version
+    fait partie de la clé: invalidate() l'incrémente, ce qui écarte les
+    entrées existantes et les calculs en cours démarrés avant l'écriture.
+
+    Le cache est propre au processus: avec plusieurs workers, chacun a le
+    sien et la fraîcheur reste bornée par le TTL.
+    """
+
+    def __init__(self, ttl: float = 10.0):
+        self.ttl = ttl
+        self._version = 0
+        self._values: dict[Hashable, tuple[float, Any]] = {}
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+
+    def invalidate(self) -> None:
+        """Invalide toutes les entrées (à appeler après une écriture)."""
+        self._version += 1
+        self._values.clear()
+
+    def clear(self) -> None:
+        """Vide le cache et oublie les calculs en cours."""
+        self.invalidate()
+        self._inflight.clear()
+
+    async def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Retourne la valeur en cache pour la clé ou la calcule.
+
+        La valeur retournée est partagée entre les appelants: elle ne doit
+        pas être modifiée.
+        """
+        versioned_key = (self._version, key)
+
+        entry = self._values.get(versioned_key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+        future = self._inflight.get(versioned_key)
+        if future is not None:
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # Le calcul initial a été annulé: le refaire
+                return await self.get_or_compute(key, compute)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[versioned_key] = future
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Marquer l'exception comme lue si aucun autre appelant n'attend
+            future.exception()
+            raise
+        finally:
+            if self._inflight.get(versioned_key) is future:
+                del self._inflight[versioned_key]
+
+        if versioned_key[0] == self._version:
+            self._values[versioned_key] = (time.monotonic() + self.ttl, value)
+        future.set_result(value)
+        return value
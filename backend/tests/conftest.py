@@ -71,6 +71,17 @@ async def db_session(test_engine) -> AsyncGenerator[AsyncSession, None]:
         await session.rollback()
 
 
+@pytest.fixture(autouse=True)
+def clear_service_caches():
+    """Vide les caches mémoire des services entre les tests (une base par test)."""
+    from services.agent_health_service import health_summary_cache
+    from services.alert_service import alerts_count_cache
+
+    health_summary_cache.clear()
+    alerts_count_cache.clear()
+    yield
+
+
 # =============================================================================
 # Model Fixtures
 # =============================================================================
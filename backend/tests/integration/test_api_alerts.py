@@ -233,3 +233,62 @@ class TestAlertsAPI:
         assert "total" in result
         assert "warning" in result
         assert "critical" in result
+
+    async def test_count_etag_through_app_middlewares(self, async_client):
+        """Test ETag et 304 avec la pile de middlewares réelle de l'application."""
+        response = await async_client.get("/api/v1/alerts/count")
+        etag = response.headers.get("etag")
+
+        assert etag is not None
+
+        response = await async_client.get(
+            "/api/v1/alerts/count", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 304
+        assert response.content == b""
+
+    async def test_batch_acknowledge(self, async_client, alert_in_db):
+        """Test POST /api/v1/alerts/acknowledge (pas capturé par /{alert_id}, IDs inconnus ignorés)."""
+        response = await async_client.post(
+            "/api/v1/alerts/acknowledge",
+            json={"ids": [alert_in_db.id, "nonexistent"]},
+            params={"user_id": "user-123"},
+        )
+
+        assert response.status_code == 200
+        result = response.json()
+        assert [a["id"] for a in result] == [alert_in_db.id]
+        assert result[0]["status"] == "acknowledged"
+        assert result[0]["acknowledged_by"] == "user-123"
+
+    async def test_batch_resolve(self, async_client, alert_in_db):
+        """Test POST /api/v1/alerts/resolve."""
+        response = await async_client.post(
+            "/api/v1/alerts/resolve",
+            json={"ids": [alert_in_db.id, "nonexistent"]},
+        )
+
+        assert response.status_code == 200
+        result = response.json()
+        assert [a["id"] for a in result] == [alert_in_db.id]
+        assert result[0]["status"] == "resolved"
+
+    async def test_batch_delete(self, async_client, alert_in_db):
+        """Test POST /api/v1/alerts/delete."""
+        response = await async_client.post(
+            "/api/v1/alerts/delete",
+            json={"ids": [alert_in_db.id, "nonexistent"]},
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"deleted": 1, "ids": [alert_in_db.id]}
+
+        response = await async_client.get(f"/api/v1/alerts/{alert_in_db.id}")
+        assert response.status_code == 404
+
+    async def test_batch_empty_ids_rejected(self, async_client):
+        """Test rejet d'une liste d'IDs vide."""
+        response = await async_client.post("/api/v1/alerts/resolve", json={"ids": []})
+
+        assert response.status_code == 422
@@ -0,0 +1,70 @@
+"""
+Tests unitaires pour AgentHealthService.
+"""
+
+import pytest
+from datetime import datetime
+
+from db.models import Host, AgentHealthStatus
+from services.agent_health_service import AgentHealthService
+
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+async def hosts_in_db(db_session):
+    """Crée des hôtes avec différents statuts de santé."""
+    now = datetime.utcnow()
+    hosts = [
+        Host(id="h1", hostname="web-1", agent_health="healthy", is_online=True, last_seen=now),
+        Host(id="h2", hostname="web-2", agent_health="unhealthy", is_online=False, last_seen=now),
+        Host(id="h3", hostname="db-1", agent_health="healthy", is_online=True, last_seen=now),
+        Host(id="h4", hostname="new-1", agent_health=None, is_online=True, last_seen=now),
+    ]
+    db_session.add_all(hosts)
+    await db_session.commit()
+    return hosts
+
+
+class TestListAgents:
+    """Tests pour AgentHealthService.list_agents."""
+
+    async def test_list_all_agents(self, db_session, hosts_in_db):
+        """Test liste complète triée par statut puis hostname."""
+        service = AgentHealthService(db_session)
+        result = await service.list_agents()
+
+        assert result["total"] == 4
+        assert [a["host_id"] for a in result["agents"]] == ["h3", "h1", "h2", "h4"]
+        assert result["agents"][-1]["agent_health"] == "unknown"
+
+    async def test_filter_by_status(self, db_session, hosts_in_db):
+        """Test filtre par statut appliqué en base."""
+        service = AgentHealthService(db_session)
+        result = await service.list_agents(AgentHealthStatus.HEALTHY)
+
+        assert result["total"] == 2
+        assert {a["hostname"] for a in result["agents"]} == {"web-1", "db-1"}
+
+    async def test_unknown_includes_missing_status(self, db_session, hosts_in_db):
+        """Test que le filtre unknown inclut les hôtes sans statut."""
+        service = AgentHealthService(db_session)
+        result = await service.list_agents(AgentHealthStatus.UNKNOWN)
+
+        assert [a["host_id"] for a in result["agents"]] == ["h4"]
+
+    async def test_stats_cover_all_agents(self, db_session, hosts_in_db):
+        """Test que les statistiques portent sur tous les agents, même filtrés."""
+        service = AgentHealthService(db_session)
+        result = await service.list_agents(AgentHealthStatus.DEGRADED)
+
+        assert result["agents"] == []
+        assert result["stats"] == {
+            "healthy": 2,
+            "degraded": 0,
+            "unhealthy": 1,
+            "unknown": 1,
+            "online": 3,
+            "offline": 1,
+        }
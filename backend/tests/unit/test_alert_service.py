@@ -209,6 +209,34 @@ class TestAlertServiceAlerts:
         assert counts["warning"] == 1
         assert counts["critical"] == 0
 
+    async def test_acknowledge_many(self, db_session, alert_in_db, sample_alert):
+        """Test acquittement de plusieurs alertes, IDs inconnus ignorés."""
+        db_session.add(Alert(**{**sample_alert, "id": "test-alert-002"}))
+        await db_session.commit()
+        service = AlertService(db_session)
+
+        alerts = await service.acknowledge_many(
+            [alert_in_db.id, "test-alert-002", "nonexistent"], user_id="user-123"
+        )
+
+        assert sorted(a.id for a in alerts) == [alert_in_db.id, "test-alert-002"]
+        assert all(a.status == AlertStatus.ACKNOWLEDGED for a in alerts)
+        assert all(a.acknowledged_by == "user-123" for a in alerts)
+        assert (await service.get_active_alerts_count())["total"] == 0
+
+    async def test_resolve_many_not_found(self, db_session):
+        """Test résolution groupée sans alerte existante."""
+        service = AlertService(db_session)
+        assert await service.resolve_many(["nonexistent"]) == []
+
+    async def test_delete_many(self, db_session, alert_in_db):
+        """Test suppression groupée."""
+        service = AlertService(db_session)
+        deleted = await service.delete_many([alert_in_db.id, "nonexistent"])
+
+        assert deleted == [alert_in_db.id]
+        assert await service.get_alert(alert_in_db.id) is None
+
 
 class TestAlertServicePatternMatching:
     """Tests pour le matching de patterns."""
@@ -0,0 +1,85 @@
+"""
+Tests unitaires pour la pagination par curseur et le streaming des logs d'audit.
+"""
+
+import json
+import pytest
+from datetime import datetime, timedelta
+
+from api.audit_routes import AuditLogsResponse, _stream_logs
+from db.auth_models import AuditLog, AuditActionType
+from services.audit_service import AuditService
+
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+async def audit_logs_in_db(db_session):
+    """Crée 5 logs d'audit, deux partageant le même timestamp."""
+    base = datetime(2024, 1, 1, 12, 0, 0)
+    timestamps = [base, base + timedelta(minutes=1), base + timedelta(minutes=2),
+                  base + timedelta(minutes=2), base + timedelta(minutes=3)]
+    logs = [
+        AuditLog(id=i + 1, timestamp=ts, action=AuditActionType.LOGIN, username=f"user{i}")
+        for i, ts in enumerate(timestamps)
+    ]
+    db_session.add_all(logs)
+    await db_session.commit()
+    return logs
+
+
+class TestAuditLogsCursor:
+    """Tests pour AuditService.get_logs avec curseur."""
+
+    async def test_pages_cover_all_logs_once(self, db_session, audit_logs_in_db):
+        """Test que les pages successives ne perdent ni ne dupliquent de log."""
+        service = AuditService(db_session)
+
+        first, total = await service.get_logs(limit=2)
+        last = first[-1]
+        second, _ = await service.get_logs(limit=2, cursor=last.timestamp, cursor_id=last.id)
+        last = second[-1]
+        third, _ = await service.get_logs(limit=2, cursor=last.timestamp, cursor_id=last.id)
+
+        assert total == 5
+        assert [log.id for log in first + second + third] == [5, 4, 3, 2, 1]
+
+    async def test_cursor_ignores_skip(self, db_session, audit_logs_in_db):
+        """Test que skip est ignoré quand un curseur est fourni."""
+        service = AuditService(db_session)
+        logs, _ = await service.get_logs(
+            skip=10, limit=10, cursor=datetime(2024, 1, 1, 12, 2, 0)
+        )
+
+        assert [log.id for log in logs] == [2, 1]
+
+    async def test_rows_are_column_projections(self, db_session, audit_logs_in_db):
+        """Test que les logs sont des lignes projetées, pas des objets ORM."""
+        service = AuditService(db_session)
+        logs, _ = await service.get_logs(limit=1)
+
+        assert not isinstance(logs[0], AuditLog)
+        assert logs[0].action == AuditActionType.LOGIN
+        assert logs[0].username == "user4"
+
+
+class TestStreamLogs:
+    """Tests pour la sérialisation en streaming."""
+
+    async def test_stream_matches_response_model(self, audit_logs_in_db):
+        """Test que le flux produit un AuditLogsResponse valide."""
+        body = b"".join([chunk async for chunk in _stream_logs(audit_logs_in_db, 5, 0, 50)])
+
+        data = json.loads(body)
+        response = AuditLogsResponse.model_validate(data)
+        assert response.total == 5
+        assert [log.id for log in response.logs] == [1, 2, 3, 4, 5]
+        assert response.logs[0].timestamp == datetime(2024, 1, 1, 12, 0, 0)
+        assert response.logs[0].details == {}
+
+    async def test_stream_empty(self):
+        """Test flux sans log."""
+        body = b"".join([chunk async for chunk in _stream_logs([], 0, 0, 50)])
+
+        assert json.loads(body) == {"logs": [], "total": 0, "skip": 0, "limit": 50}
@@ -0,0 +1,80 @@
+"""
+Tests unitaires pour la réception des connexions en colonnes (connections_batch).
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from models.schemas import AgentReport
+
+
+pytestmark = pytest.mark.unit
+
+
+HOST = {"agent_id": "agent-1", "hostname": "host-1"}
+
+BATCH = {
+    "protocol": ["tcp", "udp"],
+    "local_ip": ["172.18.0.2", "172.18.0.3"],
+    "local_port": [40000, 53],
+    "remote_ip": ["172.18.0.3", "0.0.0.0"],
+    "remote_port": [5432, 0],
+    "state": ["ESTAB", "UNCONN"],
+    "pid": [None, None],
+    "process_name": [None, None],
+    "container_id": ["abc123", None],
+    "source_method": ["proc_net", "tcpdump"],
+}
+
+
+class TestConnectionsBatch:
+    """Tests pour AgentReport.connections_batch."""
+
+    def test_batch_expanded_into_connections(self):
+        """Test que les colonnes sont reconstruites en connexions."""
+        report = AgentReport.model_validate({"host": HOST, "connections_batch": BATCH})
+
+        assert report.connections_batch is None
+        assert len(report.connections) == 2
+        first = report.connections[0]
+        assert (first.protocol, first.local_ip, first.local_port) == ("tcp", "172.18.0.2", 40000)
+        assert (first.remote_ip, first.remote_port, first.state) == ("172.18.0.3", 5432, "ESTAB")
+        assert first.container_id == "abc123"
+        assert report.connections[1].source_method == "tcpdump"
+
+    def test_batch_appended_to_row_connections(self):
+        """Test qu'un rapport peut mêler connexions en lignes et en colonnes."""
+        row = {
+            "protocol": "tcp",
+            "local_ip": "10.0.0.1",
+            "local_port": 1234,
+            "remote_ip": "10.0.0.2",
+            "remote_port": 80,
+            "state": "ESTAB",
+        }
+        report = AgentReport.model_validate(
+            {"host": HOST, "connections": [row], "connections_batch": BATCH}
+        )
+
+        assert [c.local_ip for c in report.connections] == ["10.0.0.1", "172.18.0.2", "172.18.0.3"]
+
+    def test_report_without_batch(self):
+        """Test qu'un rapport d'un ancien agent reste inchangé."""
+        report = AgentReport.model_validate({"host": HOST})
+
+        assert report.connections == []
+        assert report.connections_batch is None
+
+    def test_columns_of_different_lengths_rejected(self):
+        """Test rejet de colonnes de longueurs différentes."""
+        batch = {**BATCH, "local_port": [40000]}
+
+        with pytest.raises(ValidationError):
+            AgentReport.model_validate({"host": HOST, "connections_batch": batch})
+
+    def test_invalid_column_type_rejected(self):
+        """Test que les colonnes sont validées comme les champs ligne à ligne."""
+        batch = {**BATCH, "local_port": ["not-a-port", 53]}
+
+        with pytest.raises(ValidationError):
+            AgentReport.model_validate({"host": HOST, "connections_batch": batch})
@@ -0,0 +1,111 @@
+"""
+Tests unitaires pour ETagMiddleware.
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from httpx import AsyncClient, ASGITransport
+
+from middleware.etag import ETagMiddleware, compute_etag, etag_matches
+
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+async def client():
+    """Client HTTP sur une application minimale avec le middleware."""
+    app = FastAPI()
+    app.add_middleware(ETagMiddleware, path_prefixes=("/api/",))
+    state = {"items": ["a", "b"]}
+
+    @app.get("/api/items")
+    async def list_items():
+        return state
+
+    @app.post("/api/items")
+    async def add_item(item: str):
+        state["items"].append(item)
+        return state
+
+    @app.get("/api/stream")
+    async def stream():
+        async def chunks():
+            yield b"["
+            yield b"]"
+        return StreamingResponse(chunks(), media_type="application/json")
+
+    @app.get("/other")
+    async def other():
+        return {"ok": True}
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+class TestEtagMatches:
+    """Tests pour etag_matches."""
+
+    def test_exact_and_list(self):
+        """Test correspondance exacte et dans une liste."""
+        etag = compute_etag(b"{}")
+        assert etag_matches(etag, etag)
+        assert etag_matches(etag, f'"other", {etag}')
+
+    def test_weak_and_wildcard(self):
+        """Test comparaison faible (W/) et joker."""
+        etag = compute_etag(b"{}")
+        assert etag_matches(etag, f"W/{etag}")
+        assert etag_matches(etag, "*")
+
+    def test_no_match(self):
+        """Test absence de correspondance."""
+        assert not etag_matches(compute_etag(b"{}"), '"other"')
+        assert not etag_matches(compute_etag(b"{}"), None)
+
+
+class TestETagMiddleware:
+    """Tests pour le middleware."""
+
+    async def test_etag_header_added(self, client):
+        """Test qu'un GET JSON reçoit un ETag."""
+        response = await client.get("/api/items")
+
+        assert response.status_code == 200
+        assert response.headers["etag"] == compute_etag(response.content)
+
+    async def test_not_modified(self, client):
+        """Test qu'un If-None-Match à jour donne un 304 sans corps."""
+        etag = (await client.get("/api/items")).headers["etag"]
+
+        response = await client.get("/api/items", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    async def test_changed_content_returns_body(self, client):
+        """Test qu'un contenu modifié renvoie 200 avec un nouvel ETag."""
+        etag = (await client.get("/api/items")).headers["etag"]
+        await client.post("/api/items", params={"item": "c"})
+
+        response = await client.get("/api/items", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.json() == {"items": ["a", "b", "c"]}
+        assert response.headers["etag"] != etag
+
+    async def test_streaming_response_untouched(self, client):
+        """Test qu'une réponse en streaming n'est pas mise en tampon."""
+        response = await client.get("/api/stream")
+
+        assert response.status_code == 200
+        assert response.content == b"[]"
+        assert "etag" not in response.headers
+
+    async def test_other_paths_and_methods_untouched(self, client):
+        """Test que les chemins hors préfixe et les POST n'ont pas d'ETag."""
+        assert "etag" not in (await client.get("/other")).headers
+        assert "etag" not in (await client.post("/api/items", params={"item": "d"})).headers
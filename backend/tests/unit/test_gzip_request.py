@@ -0,0 +1,89 @@
+"""
+Tests unitaires pour GzipRequestMiddleware.
+"""
+
+import gzip
+import json
+
+import pytest
+from fastapi import FastAPI, Request
+from httpx import AsyncClient, ASGITransport
+
+from middleware.gzip_request import GzipRequestMiddleware, decompress_gzip
+
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+async def client():
+    """Client HTTP sur une application minimale avec le middleware."""
+    app = FastAPI()
+    app.add_middleware(GzipRequestMiddleware, max_size=1024)
+
+    @app.post("/echo")
+    async def echo(request: Request):
+        return {
+            "body": await request.json(),
+            "content_encoding": request.headers.get("content-encoding"),
+        }
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+class TestDecompressGzip:
+    """Tests pour decompress_gzip."""
+
+    def test_roundtrip(self):
+        """Test décompression d'un corps valide."""
+        assert decompress_gzip(gzip.compress(b"hello")) == b"hello"
+
+    def test_too_large(self):
+        """Test rejet d'un corps décompressé trop volumineux."""
+        with pytest.raises(ValueError):
+            decompress_gzip(gzip.compress(b"x" * 100), max_size=10)
+
+
+class TestGzipRequestMiddleware:
+    """Tests pour le middleware."""
+
+    async def test_gzip_body_is_decompressed(self, client):
+        """Test qu'un corps gzip arrive décompressé à la route."""
+        payload = {"containers": ["a", "b"]}
+        response = await client.post(
+            "/echo",
+            content=gzip.compress(json.dumps(payload).encode()),
+            headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"body": payload, "content_encoding": None}
+
+    async def test_plain_body_is_untouched(self, client):
+        """Test qu'un corps non compressé passe tel quel."""
+        response = await client.post("/echo", json={"a": 1})
+
+        assert response.status_code == 200
+        assert response.json()["body"] == {"a": 1}
+
+    async def test_invalid_gzip(self, client):
+        """Test rejet d'un corps gzip invalide."""
+        response = await client.post(
+            "/echo",
+            content=b"not gzip",
+            headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+        )
+
+        assert response.status_code == 400
+
+    async def test_oversized_body(self, client):
+        """Test rejet d'un corps décompressé trop volumineux."""
+        response = await client.post(
+            "/echo",
+            content=gzip.compress(b"[" + b"1," * 1000 + b"1]"),
+            headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+        )
+
+        assert response.status_code == 413
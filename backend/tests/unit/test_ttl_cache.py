@@ -0,0 +1,103 @@
+"""
+Tests unitaires pour AsyncTTLCache.
+"""
+
+import asyncio
+
+import pytest
+
+from services.ttl_cache import AsyncTTLCache
+
+
+pytestmark = pytest.mark.unit
+
+
+class Counter:
+    """Fonction de calcul qui compte ses appels."""
+
+    def __init__(self, delay: float = 0.0):
+        self.calls = 0
+        self.delay = delay
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {"calls": self.calls}
+
+
+class TestAsyncTTLCache:
+    """Tests pour AsyncTTLCache."""
+
+    async def test_value_cached_until_ttl(self):
+        """Test qu'une valeur est réutilisée tant que le TTL n'est pas écoulé."""
+        cache = AsyncTTLCache(ttl=60)
+        compute = Counter()
+
+        first = await cache.get_or_compute("k", compute)
+        second = await cache.get_or_compute("k", compute)
+
+        assert first is second
+        assert compute.calls == 1
+
+    async def test_expired_value_recomputed(self):
+        """Test qu'une valeur expirée est recalculée."""
+        cache = AsyncTTLCache(ttl=0)
+        compute = Counter()
+
+        await cache.get_or_compute("k", compute)
+        await cache.get_or_compute("k", compute)
+
+        assert compute.calls == 2
+
+    async def test_concurrent_callers_share_computation(self):
+        """Test que les appels concurrents attendent le même calcul."""
+        cache = AsyncTTLCache(ttl=60)
+        compute = Counter(delay=0.01)
+
+        results = await asyncio.gather(
+            *(cache.get_or_compute("k", compute) for _ in range(5))
+        )
+
+        assert compute.calls == 1
+        assert all(r is results[0] for r in results)
+
+    async def test_invalidate_forces_recompute(self):
+        """Test qu'une invalidation écarte la valeur en cache."""
+        cache = AsyncTTLCache(ttl=60)
+        compute = Counter()
+
+        await cache.get_or_compute("k", compute)
+        cache.invalidate()
+        result = await cache.get_or_compute("k", compute)
+
+        assert result == {"calls": 2}
+
+    async def test_invalidate_during_computation_not_cached(self):
+        """Test qu'un calcul démarré avant une écriture n'est pas mis en cache."""
+        cache = AsyncTTLCache(ttl=60)
+        compute = Counter(delay=0.01)
+
+        task = asyncio.create_task(cache.get_or_compute("k", compute))
+        await asyncio.sleep(0)
+        cache.invalidate()
+        await task
+        await cache.get_or_compute("k", compute)
+
+        assert compute.calls == 2
+
+    async def test_error_propagated_and_not_cached(self):
+        """Test qu'une erreur est transmise à tous les appelants sans être mise en cache."""
+        cache = AsyncTTLCache(ttl=60)
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("db down")
+
+        results = await asyncio.gather(
+            cache.get_or_compute("k", failing),
+            cache.get_or_compute("k", failing),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert await cache.get_or_compute("k", Counter()) == {"calls": 1}